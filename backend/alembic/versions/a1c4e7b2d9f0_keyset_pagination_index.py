@@ -0,0 +1,38 @@
+"""Add keyset pagination index on conversions
+
+Revision ID: a1c4e7b2d9f0
+Revises: 30dc063365c8
+Create Date: 2026-10-15 09:12:40.215631
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c4e7b2d9f0'
+down_revision: Union[str, None] = '30dc063365c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite index matching the library's (created_at, id) keyset ordering
+    op.create_index(
+        'idx_conversions_user_created_id',
+        'conversions',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+    # Superseded by the index above
+    op.execute('DROP INDEX IF EXISTS idx_conversions_user_created')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'idx_conversions_user_created',
+        'conversions',
+        ['user_id', sa.text('created_at DESC')]
+    )
+    op.drop_index('idx_conversions_user_created_id', table_name='conversions')
@@ -0,0 +1,49 @@
+"""Store API key hashes as raw SHA-256 digests
+
+Revision ID: a9d3f7c1e5b2
+Revises: f2c6a8d4b9e7
+Create Date: 2026-10-16 09:41:27.615380
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3f7c1e5b2'
+down_revision: Union[str, None] = 'f2c6a8d4b9e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = [('api_keys', 'key_hash'), ('users', 'api_key')]
+
+
+def upgrade() -> None:
+    # 32 raw bytes instead of 64 hex characters; existing hashes are decoded
+    # in place so issued keys keep working
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.LargeBinary(32),
+            postgresql_using=f"decode({column}, 'hex')",
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, column in COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(64),
+            postgresql_using=f"encode({column}, 'hex')",
+        )
@@ -0,0 +1,41 @@
+"""Index api_keys.prefix for key lookup
+
+Revision ID: b4e8c2a6d0f3
+Revises: a9d3f7c1e5b2
+Create Date: 2026-10-16 10:27:53.904126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e8c2a6d0f3'
+down_revision: Union[str, None] = 'a9d3f7c1e5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # API keys are looked up by prefix and verified by digest; the stored
+    # prefix is "ctxt_" plus 8 key characters, which did not fit String(10)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.alter_column('api_keys', 'prefix', type_=sa.String(16))
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_api_keys_prefix '
+            'ON api_keys (prefix)'
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_api_keys_prefix')
+    # prefix stays String(16): keys issued since upgrade would not fit String(10)
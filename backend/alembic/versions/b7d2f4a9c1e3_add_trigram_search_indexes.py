@@ -0,0 +1,50 @@
+"""Add trigram GIN indexes for substring search
+
+Revision ID: b7d2f4a9c1e3
+Revises: a1c4e7b2d9f0
+Create Date: 2026-10-15 10:04:18.662901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2f4a9c1e3'
+down_revision: Union[str, None] = 'a1c4e7b2d9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRGM_INDEXES = [
+    ('idx_conversions_title_trgm', 'conversions', 'title'),
+    ('idx_conversions_content_trgm', 'conversions', 'content'),
+    ('idx_context_stacks_name_trgm', 'context_stacks', 'name'),
+    ('idx_context_stacks_description_trgm', 'context_stacks', 'description'),
+]
+
+
+def upgrade() -> None:
+    # pg_trgm lets GIN answer unanchored ILIKE '%term%' searches without a seq scan
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Build concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        for name, table, column in TRGM_INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON {table} USING gin ({column} gin_trgm_ops)'
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for name, _, _ in TRGM_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
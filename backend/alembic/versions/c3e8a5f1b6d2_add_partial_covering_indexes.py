@@ -0,0 +1,42 @@
+"""Add partial and covering indexes for public conversion lookups
+
+Revision ID: c3e8a5f1b6d2
+Revises: b7d2f4a9c1e3
+Create Date: 2026-10-15 11:21:47.903514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a5f1b6d2'
+down_revision: Union[str, None] = 'b7d2f4a9c1e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Public slug lookups; INCLUDE makes the view-count read an index-only scan
+    op.create_index(
+        'idx_conversions_slug_public',
+        'conversions',
+        ['slug'],
+        unique=True,
+        postgresql_where=sa.text('is_public = true'),
+        postgresql_include=['view_count'],
+    )
+    # Sitemap feed: public, indexable conversions newest-updated first
+    op.create_index(
+        'idx_conversions_public_updated',
+        'conversions',
+        [sa.text('updated_at DESC')],
+        postgresql_where=sa.text('is_public = true AND is_indexed = true'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_conversions_public_updated', table_name='conversions')
+    op.drop_index('idx_conversions_slug_public', table_name='conversions')
@@ -0,0 +1,27 @@
+"""Add pre-rendered content_html column to conversions
+
+Revision ID: c7f1a3e9b5d4
+Revises: b4e8c2a6d0f3
+Create Date: 2026-10-16 11:05:18.472930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f1a3e9b5d4'
+down_revision: Union[str, None] = 'b4e8c2a6d0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Markdown rendered at write time; rows without it are rendered on read
+    op.add_column('conversions', sa.Column('content_html', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('conversions', 'content_html')
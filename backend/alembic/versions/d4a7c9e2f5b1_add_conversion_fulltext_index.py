@@ -0,0 +1,39 @@
+"""Add full-text GIN index for conversion search
+
+Revision ID: d4a7c9e2f5b1
+Revises: c3e8a5f1b6d2
+Create Date: 2026-10-15 23:02:41.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c9e2f5b1'
+down_revision: Union[str, None] = 'c3e8a5f1b6d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Must match SEARCH_DOCUMENT in app/services/conversion.py exactly
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_conversions_fts "
+            "ON conversions USING gin "
+            "(to_tsvector('english', coalesce(title, '') || ' ' || coalesce(content, '')))"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_conversions_fts')
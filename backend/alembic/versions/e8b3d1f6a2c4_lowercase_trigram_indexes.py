@@ -0,0 +1,49 @@
+"""Rebuild conversion trigram indexes on lower(column)
+
+Revision ID: e8b3d1f6a2c4
+Revises: d4a7c9e2f5b1
+Create Date: 2026-10-15 23:18:09.547712
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3d1f6a2c4'
+down_revision: Union[str, None] = 'd4a7c9e2f5b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = ['title', 'content']
+
+
+def upgrade() -> None:
+    # Search now filters on lower(column) LIKE, so the trigram indexes must be
+    # on the same expression; the old plain-column ones would go unused
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_conversions_{column}_lower_trgm '
+                f'ON conversions USING gin (lower({column}) gin_trgm_ops)'
+            )
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS idx_conversions_{column}_trgm')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_conversions_{column}_trgm '
+                f'ON conversions USING gin ({column} gin_trgm_ops)'
+            )
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS idx_conversions_{column}_lower_trgm')
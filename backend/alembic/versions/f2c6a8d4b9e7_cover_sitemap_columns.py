@@ -0,0 +1,48 @@
+"""Cover sitemap columns in the public updated_at indexes
+
+Revision ID: f2c6a8d4b9e7
+Revises: e8b3d1f6a2c4
+Create Date: 2026-10-16 00:12:36.284019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a8d4b9e7'
+down_revision: Union[str, None] = 'e8b3d1f6a2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The sitemap only reads these columns; INCLUDE makes both scans index-only
+    op.drop_index('idx_conversions_public_updated', table_name='conversions')
+    op.create_index(
+        'idx_conversions_public_updated',
+        'conversions',
+        [sa.text('updated_at DESC')],
+        postgresql_where=sa.text('is_public = true AND is_indexed = true'),
+        postgresql_include=['slug', 'created_at', 'view_count'],
+    )
+    op.create_index(
+        'idx_context_stacks_public_updated',
+        'context_stacks',
+        [sa.text('updated_at DESC')],
+        postgresql_where=sa.text('is_public = true'),
+        postgresql_include=['id', 'created_at', 'use_count', 'is_template', 'last_used_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_context_stacks_public_updated', table_name='context_stacks')
+    op.drop_index('idx_conversions_public_updated', table_name='conversions')
+    op.create_index(
+        'idx_conversions_public_updated',
+        'conversions',
+        [sa.text('updated_at DESC')],
+        postgresql_where=sa.text('is_public = true AND is_indexed = true'),
+    )
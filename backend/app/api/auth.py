@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
+from sqlalchemy import exists, func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.db.database import get_db
-from app.models import User
+from app.models import User, Conversion, ApiKey
 from app.schemas import (
     UserCreate, 
     UserLogin, 
@@ -14,14 +15,14 @@ from app.schemas import (
     ApiKeyResponse
 )
 from app.core.auth import (
-    verify_password, 
+    verify_and_update_password, 
     get_password_hash, 
     create_tokens_for_user,
     verify_token,
     get_current_active_user,
     generate_api_key
 )
-from app.core.config import get_daily_limit
+from app.core.config import get_daily_limit, get_daily_reset_at
 from app.core.exceptions import (
     AuthenticationError,
     ValidationError,
@@ -29,37 +30,36 @@ from app.core.exceptions import (
 )
 from app.core.validators import (
     EmailValidator,
-    PasswordValidator,
     APIKeyValidator
 )
 import logging
 from datetime import datetime, timedelta
-import uuid
+from app.core.ids import uuid7
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 security = HTTPBearer()
 
 @router.post("/register", response_model=Token)
-async def register_user(
+def register_user(
     user_data: UserCreate,
     db: Session = Depends(get_db)
 ):
     """Register a new user"""
     try:
-        # Validate email and password
-        validated_email = EmailValidator.validate_email(user_data.email)
-        validated_password = PasswordValidator.validate_password(user_data.password)
+        # Email and password are validated by UserCreate
+        validated_email = user_data.email
+        validated_password = user_data.password
         
-        # Check if user already exists
-        existing_user = db.query(User).filter(User.email == validated_email).first()
-        if existing_user:
+        # Check if user already exists (SELECT EXISTS, no row materialization).
+        # Kept ahead of hashing so duplicates don't pay for argon2.
+        if db.query(exists().where(User.email == validated_email)).scalar():
             raise ValidationError("Email already registered", "email", validated_email)
         
         # Create new user
         hashed_password = get_password_hash(validated_password)
         user = User(
-            id=uuid.uuid4(),
+            id=uuid7(),
             email=validated_email,
             hashed_password=hashed_password,
             tier="free",
@@ -91,7 +91,7 @@ async def register_user(
         raise DatabaseError("User registration failed", "create_user")
 
 @router.post("/login", response_model=Token)
-async def login_user(
+def login_user(
     user_data: UserLogin,
     db: Session = Depends(get_db)
 ):
@@ -104,12 +104,17 @@ async def login_user(
     if not user:
         raise AuthenticationError("Invalid email or password")
     
-    if not verify_password(user_data.password, user.hashed_password):
+    verified, new_hash = verify_and_update_password(user_data.password, user.hashed_password)
+    if not verified:
         raise AuthenticationError("Invalid email or password")
     
     if not user.is_active:
         raise AuthenticationError("Account is inactive")
     
+    # Transparently migrate legacy bcrypt hashes to argon2
+    if new_hash:
+        user.hashed_password = new_hash
+    
     # Update last login
     user.last_login_at = datetime.utcnow()
     db.commit()
@@ -122,7 +127,7 @@ async def login_user(
     return Token(**tokens, user=user)
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(
+def refresh_token(
     refresh_token: str,
     db: Session = Depends(get_db)
 ):
@@ -156,25 +161,22 @@ async def get_current_user_info(
     return current_user
 
 @router.get("/usage", response_model=UsageStats)
-async def get_usage_stats(
+def get_usage_stats(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get user's usage statistics"""
-    # Calculate daily usage (last 24 hours)
-    yesterday = datetime.utcnow() - timedelta(days=1)
-    from app.models import Conversion
-    daily_conversions = db.query(Conversion).filter(
-        Conversion.user_id == current_user.id,
-        Conversion.created_at >= yesterday
-    ).count()
-    
-    # Calculate monthly usage (last 30 days)
-    month_ago = datetime.utcnow() - timedelta(days=30)
-    monthly_conversions = db.query(Conversion).filter(
+    # Daily (last 24 hours) and monthly (last 30 days) usage in one index range scan
+    now = datetime.utcnow()
+    yesterday = now - timedelta(days=1)
+    month_ago = now - timedelta(days=30)
+    daily_conversions, monthly_conversions = db.query(
+        func.count().filter(Conversion.created_at >= yesterday),
+        func.count()
+    ).filter(
         Conversion.user_id == current_user.id,
         Conversion.created_at >= month_ago
-    ).count()
+    ).one()
     
     # Get daily limit for user's tier
     daily_limit = get_daily_limit(current_user.tier)
@@ -183,11 +185,7 @@ async def get_usage_stats(
     
     if daily_limit:
         quota_remaining = max(0, daily_limit - daily_conversions)
-        # Reset at midnight UTC
-        tomorrow = datetime.utcnow().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ) + timedelta(days=1)
-        reset_at = tomorrow
+        reset_at = get_daily_reset_at()
     
     return UsageStats(
         daily_conversions=daily_conversions,
@@ -198,13 +196,12 @@ async def get_usage_stats(
     )
 
 @router.post("/api-keys", response_model=ApiKeyResponse)
-async def create_api_key(
+def create_api_key(
     key_data: ApiKeyCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Create new API key for user"""
-    from app.models import ApiKey
     
     # Generate API key
     full_key, prefix, key_hash = generate_api_key()
@@ -216,7 +213,7 @@ async def create_api_key(
     
     # Create API key record
     api_key = ApiKey(
-        id=uuid.uuid4(),
+        id=uuid7(),
         user_id=current_user.id,
         name=key_data.name,
         prefix=prefix,
@@ -1,30 +1,36 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete
+from sqlalchemy.orm import Session, raiseload
+from typing import Iterator, List, Optional
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape, quoteattr
 from app.db.database import get_db
-from app.models import ContextStack, User
+from app.models import ContextStack
 from app.schemas import (
     ContextStackCreate,
     ContextStack as ContextStackSchema,
     ContextStackExport
 )
-from app.core.auth import get_current_active_user
+from app.core.auth import TokenUser, get_token_user
+from app.services.counter_buffer import counter_buffer
 import logging
-import uuid
+import orjson
+from app.core.ids import uuid7
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.post("/", response_model=ContextStackSchema)
-async def create_context_stack(
+def create_context_stack(
     stack_data: ContextStackCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """Create a new context stack"""
     try:
         context_stack = ContextStack(
-            id=uuid.uuid4(),
+            id=uuid7(),
             user_id=current_user.id,
             name=stack_data.name,
             description=stack_data.description,
@@ -50,18 +56,22 @@ async def create_context_stack(
         )
 
 @router.get("/", response_model=List[ContextStackSchema])
-async def list_context_stacks(
+def list_context_stacks(
     search: Optional[str] = None,
     is_template: Optional[bool] = None,
     limit: int = 20,
     offset: int = 0,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """List user's context stacks"""
-    query = db.query(ContextStack).filter(ContextStack.user_id == current_user.id)
+    # The response schema has no relationships; fail loudly on any lazy load
+    query = db.query(ContextStack).options(raiseload("*")).filter(
+        ContextStack.user_id == current_user.id
+    )
     
     if search:
+        # Served by the pg_trgm GIN indexes on Postgres
         search_pattern = f"%{search}%"
         query = query.filter(
             ContextStack.name.ilike(search_pattern) |
@@ -78,10 +88,10 @@ async def list_context_stacks(
     return context_stacks
 
 @router.get("/{stack_id}", response_model=ContextStackSchema)
-async def get_context_stack(
+def get_context_stack(
     stack_id: str,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_active_user)
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """Get a specific context stack"""
     query = db.query(ContextStack).filter(ContextStack.id == stack_id)
@@ -104,19 +114,19 @@ async def get_context_stack(
             detail="Context stack not found"
         )
     
-    # Increment use count
-    context_stack.use_count += 1
-    context_stack.last_used_at = db.func.now()
-    db.commit()
+    # Buffer the use; the background flush writes it to the database
+    pending = counter_buffer.bump("use", context_stack.id)
     
-    return context_stack
+    return ContextStackSchema.model_validate(context_stack).model_copy(
+        update={"use_count": context_stack.use_count + pending}
+    )
 
 @router.put("/{stack_id}", response_model=ContextStackSchema)
-async def update_context_stack(
+def update_context_stack(
     stack_id: str,
     stack_data: ContextStackCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """Update a context stack"""
     context_stack = db.query(ContextStack).filter(
@@ -143,34 +153,36 @@ async def update_context_stack(
     return context_stack
 
 @router.delete("/{stack_id}")
-async def delete_context_stack(
+def delete_context_stack(
     stack_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """Delete a context stack"""
-    context_stack = db.query(ContextStack).filter(
-        ContextStack.id == stack_id,
-        ContextStack.user_id == current_user.id
-    ).first()
+    # Owner-scoped DELETE ... RETURNING: one round-trip, no pre-SELECT
+    deleted = db.execute(
+        delete(ContextStack)
+        .where(ContextStack.id == stack_id, ContextStack.user_id == current_user.id)
+        .returning(ContextStack.id)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
     
-    if not context_stack:
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Context stack not found"
         )
     
-    db.delete(context_stack)
     db.commit()
     
     return {"message": "Context stack deleted successfully"}
 
 @router.post("/{stack_id}/export")
-async def export_context_stack(
+def export_context_stack(
     stack_id: str,
     export_options: ContextStackExport,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_active_user)
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """Export context stack in various formats"""
     query = db.query(ContextStack).filter(ContextStack.id == stack_id)
@@ -195,26 +207,8 @@ async def export_context_stack(
     # Format based on export options
     blocks = context_stack.blocks
     
-    if export_options.format == "xml":
-        if export_options.custom_wrapper:
-            content = f"<{export_options.custom_wrapper}>"
-        else:
-            content = "<context>"
-            
-        for i, block in enumerate(blocks):
-            if block.get('type') == 'url':
-                content += f"\n  <source_{i+1} url=\"{block.get('url', '')}\" title=\"{block.get('title', 'Untitled')}\">\n    {block.get('content', '')}\n  </source_{i+1}>"
-            else:
-                content += f"\n  <text_{i+1}>\n    {block.get('content', '')}\n  </text_{i+1}>"
-        
-        if export_options.custom_wrapper:
-            content += f"\n</{export_options.custom_wrapper}>"
-        else:
-            content += "\n</context>"
-            
-    elif export_options.format == "json":
-        import json
-        content = json.dumps({
+    if export_options.format == "json":
+        chunks = iter([orjson.dumps({
             "name": context_stack.name,
             "description": context_stack.description,
             "blocks": blocks,
@@ -222,51 +216,56 @@ async def export_context_stack(
                 "created_at": context_stack.created_at.isoformat(),
                 "use_count": context_stack.use_count
             }
-        }, indent=2)
-        
+        }, option=orjson.OPT_INDENT_2).decode()])
+    elif export_options.format == "xml":
+        chunks = _iter_xml_export(blocks, export_options.custom_wrapper)
     else:  # markdown
-        content_lines = [
-            f"# {context_stack.name}",
-            ""
-        ]
-        
-        if context_stack.description:
-            content_lines.extend([
-                context_stack.description,
-                ""
-            ])
-        
-        for i, block in enumerate(blocks):
-            if block.get('type') == 'url':
-                content_lines.extend([
-                    f"## Source {i+1}: {block.get('title', 'Untitled')}",
-                    f"**URL:** {block.get('url', '')}",
-                    "",
-                    block.get('content', ''),
-                    "",
-                    "---",
-                    ""
-                ])
-            else:
-                content_lines.extend([
-                    f"## Text Block {i+1}",
-                    "",
-                    block.get('content', ''),
-                    "",
-                    "---",
-                    ""
-                ])
-        
-        content = "\\n".join(content_lines)
+        chunks = _iter_markdown_export(context_stack.name, context_stack.description, blocks)
     
-    # Increment use count
-    context_stack.use_count += 1
-    context_stack.last_used_at = db.func.now()
-    db.commit()
+    # Buffer the use; the background flush writes it to the database
+    counter_buffer.bump("use", context_stack.id)
+    
+    if export_options.stream:
+        # Blocks are already in memory, so the body can be sent as it is built
+        return StreamingResponse(
+            chunks,
+            media_type=EXPORT_MEDIA_TYPES[export_options.format],
+            headers={"Content-Disposition": f'attachment; filename="{stack_id}.{export_options.format}"'}
+        )
     
     return {
-        "content": content,
+        "content": "".join(chunks),
         "format": export_options.format,
         "name": context_stack.name,
-        "exported_at": db.func.now()
-    }
\ No newline at end of file
+        "exported_at": datetime.now(timezone.utc)
+    }
+
+EXPORT_MEDIA_TYPES = {
+    "xml": "application/xml",
+    "json": "application/json",
+    "markdown": "text/markdown",
+}
+
+def _iter_xml_export(blocks: List[dict], custom_wrapper: Optional[str]) -> Iterator[str]:
+    """Yield the XML export one block at a time"""
+    wrapper = custom_wrapper or "context"
+    yield f"<{wrapper}>"
+    for i, block in enumerate(blocks):
+        content = escape(block.get('content') or '')
+        if block.get('type') == 'url':
+            yield f"\n  <source_{i+1} url={quoteattr(block.get('url') or '')} title={quoteattr(block.get('title') or 'Untitled')}>\n    {content}\n  </source_{i+1}>"
+        else:
+            yield f"\n  <text_{i+1}>\n    {content}\n  </text_{i+1}>"
+    yield f"\n</{wrapper}>"
+
+def _iter_markdown_export(name: str, description: Optional[str], blocks: List[dict]) -> Iterator[str]:
+    """Yield the markdown export one block at a time"""
+    yield f"# {name}\n\n"
+    if description:
+        yield f"{description}\n\n"
+    for i, block in enumerate(blocks):
+        if block.get('type') == 'url':
+            heading = f"## Source {i+1}: {block.get('title', 'Untitled')}\n**URL:** {block.get('url', '')}"
+        else:
+            heading = f"## Text Block {i+1}"
+        yield f"{heading}\n\n{block.get('content', '')}\n\n---\n\n"
\ No newline at end of file
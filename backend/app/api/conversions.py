@@ -1,22 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session, load_only, raiseload
+from sqlalchemy import delete, lambda_stmt, select, tuple_, update
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql import func
 from typing import List, Optional
 from datetime import datetime, timezone, timedelta
+from urllib.parse import urlparse
 from app.db.database import get_db
-from app.models import Conversion, User
+from app.models import Conversion
 from app.schemas import (
     ConversionRequest, 
     Conversion as ConversionSchema,
     ConversionList,
+    ConversionListItem,
     ConversionSave,
     ConversionResponse,
     ConversionCreateFromClient
 )
-from app.services.conversion import conversion_service
+from app.services.conversion import conversion_service, count_words, calculate_reading_time, render_markdown, search_filter
 from app.services.rate_limiter import rate_limiter
+from app.services.counter_buffer import counter_buffer
+from app.services.cache import conversion_cache, invalidate_conversion
 from app.services.token_counter import count_tokens
-from app.core.auth import get_current_active_user, get_current_user_optional
+from app.core.auth import TokenUser, get_token_user, get_current_user_optional
 from app.core.exceptions import (
     ConversionError, 
     RateLimitError, 
@@ -24,7 +30,10 @@ from app.core.exceptions import (
     ResourceNotFoundError
 )
 from app.core.validators import URLValidator, validate_pagination
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.ids import uuid7
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -35,7 +44,7 @@ async def test_endpoint():
     return {"message": "Test endpoint works"}
 
 @router.get("/cache/check")
-async def check_conversion_cache(
+def check_conversion_cache(
     url: str,
     db: Session = Depends(get_db)
 ):
@@ -74,7 +83,8 @@ async def check_conversion_cache(
 
 @router.post("/convert")
 async def convert_url(
-    request: ConversionRequest
+    request: ConversionRequest,
+    response: Response
 ):
     """Convert a URL to markdown format"""
     try:
@@ -104,13 +114,11 @@ async def convert_url(
         )
         
         # Generate slug - temporarily just use a simple slug
-        import uuid
         slug = f"test-{str(uuid.uuid4())[:8]}"
         
         # Return a mock conversion for testing
-        from app.schemas import Conversion as ConversionSchema
         conversion = {
-            "id": str(uuid.uuid4()),
+            "id": str(uuid7()),
             "slug": slug,
             "user_id": None,
             "source_url": conversion_data["source_url"],
@@ -127,9 +135,7 @@ async def convert_url(
         logger.info(f"Converted URL successfully: {request.url} -> {slug}")
         
         # Add rate limit headers to response
-        # Note: In FastAPI, headers need to be added via Response object
-        # For now, we'll include rate info in response metadata
-        conversion["_rate_limit"] = rate_info
+        response.headers.update(rate_limiter.get_rate_limit_headers(rate_info))
         
         return conversion
         
@@ -141,16 +147,12 @@ async def convert_url(
         )
 
 @router.post("/conversions", response_model=ConversionSchema)
-async def create_conversion(
+def create_conversion(
     request: ConversionCreateFromClient,
     db: Session = Depends(get_db)
 ):
     """Create a new conversion from client-side processed data or update existing cached version"""
     try:
-        import uuid
-        import re
-        from urllib.parse import urlparse
-        
         # Check if we have an existing conversion for this URL within 48 hours
         # Skip caching for context stacks as they should always be unique
         existing_conversion = None
@@ -162,8 +164,8 @@ async def create_conversion(
             ).order_by(Conversion.created_at.desc()).first()
         
         # Calculate word count, reading time, and token count
-        word_count = len(request.content.split()) if request.content else 0
-        reading_time = max(1, round(word_count / 200))  # 200 words per minute
+        word_count = count_words(request.content)
+        reading_time = calculate_reading_time(word_count)
         token_count = count_tokens(request.content) if request.content else 0
         
         # Extract domain
@@ -178,6 +180,7 @@ async def create_conversion(
             # Update existing conversion with fresh content
             existing_conversion.title = request.title
             existing_conversion.content = request.content
+            existing_conversion.content_html = render_markdown(request.content)
             existing_conversion.meta_description = meta_description
             existing_conversion.word_count = word_count
             existing_conversion.reading_time = reading_time
@@ -187,34 +190,30 @@ async def create_conversion(
             
             db.commit()
             db.refresh(existing_conversion)
+            invalidate_conversion(existing_conversion.slug)
             
             logger.info(f"Updated cached conversion: {request.source_url} -> {existing_conversion.slug}")
             return existing_conversion
         else:
             # Create new conversion
             slug_base = conversion_service.generate_slug(request.source_url, request.title)
-            slug = conversion_service.ensure_unique_slug(db, slug_base)
-            
-            conversion = Conversion(
-                id=uuid.uuid4(),
-                slug=slug,
+            conversion = conversion_service.insert_with_unique_slug(db, slug_base, dict(
+                id=uuid7(),
                 source_url=request.source_url,
                 title=request.title,
                 domain=domain,
                 content=request.content,
+                content_html=render_markdown(request.content),
                 meta_description=meta_description,
                 word_count=word_count,
                 reading_time=reading_time,
                 token_count=token_count,
                 is_public=True,
                 view_count=0
-            )
-            
-            db.add(conversion)
+            ))
             db.commit()
-            db.refresh(conversion)
             
-            logger.info(f"Created new conversion: {request.source_url} -> {slug}")
+            logger.info(f"Created new conversion: {request.source_url} -> {conversion.slug}")
             return conversion
         
     except Exception as e:
@@ -225,79 +224,130 @@ async def create_conversion(
         )
 
 @router.post("/conversions/{conversion_id}/save", response_model=ConversionResponse)
-async def save_conversion(
+def save_conversion(
     conversion_id: str,
     save_data: ConversionSave,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """Save a conversion to user's library"""
-    conversion = db.query(Conversion).filter(Conversion.id == conversion_id).first()
-    
-    if not conversion:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Conversion not found"
-        )
-    
     # Update conversion with user info
-    conversion.user_id = current_user.id
-    conversion.is_public = save_data.make_public
+    values = {"user_id": current_user.id, "is_public": save_data.make_public}
     
     # Process tags if provided
     if save_data.tags:
         # Convert tags to topics array for storage
-        conversion.topics = save_data.tags
+        values["topics"] = save_data.tags
+    
+    # UPDATE ... RETURNING slug: one round-trip, the content column is never read
+    slug = db.execute(
+        update(Conversion)
+        .where(Conversion.id == conversion_id)
+        .values(values)
+        .returning(Conversion.slug)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    
+    if slug is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversion not found"
+        )
     
     db.commit()
+    invalidate_conversion(slug)
     
     return ConversionResponse(
-        slug=conversion.slug,
-        permanent_url=f"https://ctxt.help/read/{conversion.slug}",
+        slug=slug,
+        permanent_url=f"https://ctxt.help/read/{slug}",
         seo_optimized=True
     )
 
+LIST_ITEM_COLUMNS = [
+    getattr(Conversion, name) for name in ConversionListItem.model_fields
+]
+
 @router.get("/conversions", response_model=ConversionList)
-async def list_conversions(
+def list_conversions(
     search: Optional[str] = None,
     limit: int = 10,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: TokenUser = Depends(get_token_user)
 ):
-    """List user's saved conversions"""
-    query = db.query(Conversion).filter(Conversion.user_id == current_user.id)
-    
+    """List user's saved conversions using keyset pagination on (created_at, id)"""
+    limit, offset = validate_pagination(limit, offset)
+    # Load only the columns ConversionListItem serializes (never the content
+    # blob); the schema has no relationships, so fail loudly on any lazy load
+    query = db.query(Conversion).options(
+        load_only(*LIST_ITEM_COLUMNS, raiseload=True),
+        raiseload("*")
+    ).filter(
+        Conversion.user_id == current_user.id
+    )
+
     if search:
-        # Use parameterized query to prevent SQL injection
-        search_pattern = f"%{search}%"
+        # Results stay in (created_at, id) order so cursors remain valid
+        query = query.filter(search_filter(search, db.get_bind().dialect.name))
+
+    # COUNT(*) scans every matching row, so only pay for it when asked
+    total = query.count() if include_total else None
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
         query = query.filter(
-            Conversion.title.ilike(search_pattern) |
-            Conversion.content.ilike(search_pattern)
+            tuple_(Conversion.created_at, Conversion.id) < tuple_(cursor_created_at, cursor_id)
         )
-    
-    total = query.count()
-    conversions = query.order_by(Conversion.created_at.desc()).offset(offset).limit(limit).all()
-    
+    elif offset:
+        # Legacy offset paging for clients that have not moved to cursors
+        query = query.offset(offset)
+
+    # Fetch one extra row to detect whether another page exists
+    conversions = query.order_by(
+        Conversion.created_at.desc(),
+        Conversion.id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(conversions) > limit:
+        conversions = conversions[:limit]
+        last = conversions[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
     return ConversionList(
         items=conversions,
         total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
     )
 
+# Hot public lookups as lambda statements: SQLAlchemy caches each one by the
+# lambda's code location, so per call only the bound value is new
+def _public_conversion_by_id(conversion_id: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Conversion).where(
+        Conversion.id == conversion_id, Conversion.is_public == True
+    ))
+
+def _public_conversion_by_slug(slug: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Conversion).where(
+        Conversion.slug == slug, Conversion.is_public == True
+    ))
+
+def _public_view_count_by_slug(slug: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Conversion.view_count).where(
+        Conversion.slug == slug, Conversion.is_public == True
+    ))
+
 @router.get("/conversions/{conversion_id}", response_model=ConversionSchema)
-async def get_conversion(
+def get_conversion(
     conversion_id: str,
     db: Session = Depends(get_db)
 ):
     """Get a specific conversion"""
-    query = db.query(Conversion).filter(
-        Conversion.id == conversion_id,
-        Conversion.is_public == True
-    )
-    
-    conversion = query.first()
+    conversion = db.execute(_public_conversion_by_id(conversion_id)).scalar_one_or_none()
     
     if not conversion:
         raise HTTPException(
@@ -305,74 +355,83 @@ async def get_conversion(
             detail="Conversion not found"
         )
     
-    # Increment view count
-    conversion.view_count += 1
-    db.commit()
+    # Buffer the view; the background flush writes it to the database
+    pending = counter_buffer.bump("view", conversion.slug)
     
-    return conversion
+    return ConversionSchema.model_validate(conversion).model_copy(
+        update={"view_count": conversion.view_count + pending}
+    )
 
 @router.delete("/conversions/{conversion_id}")
-async def delete_conversion(
+def delete_conversion(
     conversion_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: TokenUser = Depends(get_token_user)
 ):
     """Delete a conversion"""
-    conversion = db.query(Conversion).filter(
-        Conversion.id == conversion_id,
-        Conversion.user_id == current_user.id
-    ).first()
+    # Owner-scoped DELETE ... RETURNING: one round-trip, no pre-SELECT
+    slug = db.execute(
+        delete(Conversion)
+        .where(Conversion.id == conversion_id, Conversion.user_id == current_user.id)
+        .returning(Conversion.slug)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
     
-    if not conversion:
+    if slug is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Conversion not found"
         )
     
-    db.delete(conversion)
     db.commit()
+    invalidate_conversion(slug)
     
     return {"message": "Conversion deleted successfully"}
 
 @router.get("/conversions/slug/{slug}", response_model=ConversionSchema)
-async def get_conversion_by_slug(
+def get_conversion_by_slug(
     slug: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Get a conversion by slug for SSR/frontend data fetching"""
-    conversion = db.query(Conversion).filter(
-        Conversion.slug == slug,
-        Conversion.is_public == True
-    ).first()
+    cached = conversion_cache.get(slug)
     
-    if not conversion:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Conversion with slug '{slug}' not found"
-        )
+    if cached is None:
+        conversion = db.execute(_public_conversion_by_slug(slug)).scalar_one_or_none()
+        
+        if not conversion:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Conversion with slug '{slug}' not found"
+            )
+        
+        body = ConversionSchema.model_validate(conversion).model_dump_json().encode()
+        cached = conversion_cache.set(slug, body)
+    
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
     
-    return conversion
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.post("/conversions/slug/{slug}/view")
-async def increment_view_count(
+def increment_view_count(
     slug: str,
     db: Session = Depends(get_db)
 ):
     """Increment view count for a conversion"""
-    conversion = db.query(Conversion).filter(
-        Conversion.slug == slug,
-        Conversion.is_public == True
-    ).first()
+    # Read-only lookup; the increment is buffered and flushed in batches
+    stored_count = db.execute(_public_view_count_by_slug(slug)).scalar_one_or_none()
     
-    if not conversion:
+    if stored_count is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Conversion with slug '{slug}' not found"
         )
     
-    # Increment view count
-    conversion.view_count += 1
-    conversion.last_viewed_at = func.now()
-    db.commit()
+    pending = counter_buffer.bump("view", slug)
     
-    return {"message": "View count updated", "view_count": conversion.view_count}
\ No newline at end of file
+    return {"message": "View count updated", "view_count": stored_count + pending}
\ No newline at end of file
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
-from typing import Dict, Any, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 import hmac
-import hashlib
-import json
+import orjson
+import time
 import logging
 
 from app.core.config import settings
@@ -14,6 +16,7 @@ logger = logging.getLogger(__name__)
 from app.core.auth import get_current_user
 from app.db.database import get_db
 from app.models import User
+from app.services.cache import ResponseCache
 from app.services.payment import get_polar_service
 from app.schemas.payment import (
     CreateCheckoutRequest,
@@ -69,6 +72,32 @@ async def create_checkout_session(
             detail="Failed to create checkout session"
         )
 
+# Polar subscriptions by id, so page loads don't each make an API round-trip.
+# Webhook events and cancellations drop the affected entry.
+SUBSCRIPTION_CACHE_TTL = 60  # seconds
+SUBSCRIPTION_CACHE_MAXSIZE = 10000
+_subscription_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+def _get_cached_subscription(subscription_id: str) -> Optional[Any]:
+    entry = _subscription_cache.get(subscription_id)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del _subscription_cache[subscription_id]
+        return None
+    return entry[1]
+
+def _cache_subscription(subscription_id: str, subscription: Any) -> None:
+    _subscription_cache[subscription_id] = (time.monotonic() + SUBSCRIPTION_CACHE_TTL, subscription)
+    _subscription_cache.move_to_end(subscription_id)
+    while len(_subscription_cache) > SUBSCRIPTION_CACHE_MAXSIZE:
+        _subscription_cache.popitem(last=False)
+
+def invalidate_subscription(subscription_id: Optional[str]) -> None:
+    """Drop a cached subscription after it changes"""
+    if subscription_id:
+        _subscription_cache.pop(subscription_id, None)
+
 @router.get("/subscription", response_model=SubscriptionResponse)
 async def get_user_subscription(
     current_user: User = Depends(get_current_user)
@@ -92,9 +121,13 @@ async def get_user_subscription(
             )
         
         # Get subscription details from Polar
-        subscription = await polar_service.get_subscription(
-            current_user.polar_subscription_id
-        )
+        subscription = _get_cached_subscription(current_user.polar_subscription_id)
+        if subscription is None:
+            subscription = await polar_service.get_subscription(
+                current_user.polar_subscription_id
+            )
+            if subscription:
+                _cache_subscription(current_user.polar_subscription_id, subscription)
         
         if not subscription:
             return SubscriptionResponse(
@@ -150,6 +183,7 @@ async def cancel_subscription(
                 detail="Failed to cancel subscription"
             )
         
+        invalidate_subscription(current_user.polar_subscription_id)
         return {"message": "Subscription canceled successfully"}
         
     except HTTPException:
@@ -161,6 +195,16 @@ async def cancel_subscription(
             detail="Failed to cancel subscription"
         )
 
+# Polar event payloads are a few KB; anything far larger is not a real event
+WEBHOOK_MAX_BODY_SIZE = 256 * 1024
+
+@lru_cache(maxsize=1)
+def _webhook_secret() -> Optional[bytes]:
+    """Webhook secret encoded once instead of on every request"""
+    if not settings.polar_webhook_secret:
+        return None
+    return settings.polar_webhook_secret.encode()
+
 @router.post("/webhook")
 async def handle_polar_webhook(
     request: Request,
@@ -168,30 +212,44 @@ async def handle_polar_webhook(
 ):
     """Handle Polar webhook events"""
     try:
-        # Get the raw body
-        body = await request.body()
-        
-        # Verify webhook signature
+        # Cheap header checks before any of the body is read
         signature = request.headers.get("polar-webhook-signature")
-        if not signature or not settings.polar_webhook_secret:
+        secret = _webhook_secret()
+        if not signature or not secret:
             logger.warning("Missing webhook signature or secret")
             raise HTTPException(status_code=400, detail="Invalid signature")
         
-        # Verify the signature
-        expected_signature = hmac.new(
-            settings.polar_webhook_secret.encode(),
-            body,
-            hashlib.sha256
-        ).hexdigest()
+        # Signature is a hex SHA-256 HMAC; malformed values fail fast
+        try:
+            signature_bytes = bytes.fromhex(signature)
+        except ValueError:
+            signature_bytes = b""
+        if len(signature_bytes) != 32:
+            logger.warning("Invalid webhook signature")
+            raise HTTPException(status_code=400, detail="Invalid signature")
+        
+        content_length = request.headers.get("content-length", "0")
+        if content_length.isdigit() and int(content_length) > WEBHOOK_MAX_BODY_SIZE:
+            logger.warning(f"Webhook body too large: {content_length} bytes")
+            raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail="Payload too large")
         
-        if not hmac.compare_digest(signature, expected_signature):
+        # MAC the body as it streams in, keeping the chunks for parsing
+        mac = hmac.new(secret, digestmod="sha256")
+        chunks = []
+        async for chunk in request.stream():
+            mac.update(chunk)
+            chunks.append(chunk)
+        
+        if not hmac.compare_digest(mac.digest(), signature_bytes):
             logger.warning("Invalid webhook signature")
             raise HTTPException(status_code=400, detail="Invalid signature")
         
+        body = b"".join(chunks)
+        
         # Parse the event
         try:
-            event = json.loads(body.decode())
-        except json.JSONDecodeError:
+            event = orjson.loads(body)
+        except orjson.JSONDecodeError:
             logger.error("Failed to parse webhook JSON")
             raise HTTPException(status_code=400, detail="Invalid JSON")
         
@@ -213,6 +271,9 @@ async def handle_polar_webhook(
         
         success = await polar_service.handle_webhook_event(event_type, event_data)
         
+        if event_type.startswith("subscription."):
+            invalidate_subscription(event_data.get("id"))
+        
         if success:
             return {"message": "Webhook processed successfully"}
         else:
@@ -230,91 +291,106 @@ async def handle_polar_webhook(
             detail="Internal server error"
         )
 
+@lru_cache(maxsize=1)
+def _products_body() -> Tuple[str, bytes]:
+    """
+    Product list as (etag, JSON bytes). Products only depend on settings,
+    so the body is built and serialized once per process.
+    """
+    # Product configuration - uses environment variables for product IDs
+    products = []
+    
+    # Power User tier
+    if settings.polar_power_product_id:
+        products.append({
+            "id": settings.polar_power_product_id,
+            "name": "Power User",
+            "description": "Unlimited conversions, library, exports, and browser extension",
+            "price": 5,
+            "currency": "USD",
+            "interval": "month",
+            "tier": "power",
+            "features": [
+                "Unlimited conversions",
+                "Conversion library",
+                "Advanced export (PDF, DOCX)",
+                "Context templates",
+                "Browser extension",
+                "Priority conversion"
+            ]
+        })
+    
+    # Pro tier
+    if settings.polar_pro_product_id:
+        products.append({
+            "id": settings.polar_pro_product_id,
+            "name": "Pro",
+            "description": "AI integration, API access, and team features",
+            "price": 15,
+            "currency": "USD",
+            "interval": "month",
+            "tier": "pro",
+            "features": [
+                "Everything in Power User",
+                "MCP Server access",
+                "API access",
+                "Advanced context tools",
+                "Team sharing",
+                "Analytics dashboard",
+                "Priority support"
+            ]
+        })
+    
+    # Enterprise tier (custom pricing)
+    if settings.polar_enterprise_product_id:
+        products.append({
+            "id": settings.polar_enterprise_product_id,
+            "name": "Enterprise",
+            "description": "Self-hosted, custom features, and dedicated support",
+            "price": None,  # Custom pricing
+            "currency": "USD",
+            "interval": "custom",
+            "tier": "enterprise",
+            "features": [
+                "Self-hosted MCP server",
+                "Custom rate limits",
+                "SSO integration",
+                "Custom features",
+                "SLA guarantees",
+                "Dedicated support"
+            ],
+            "contact_required": True
+        })
+    
+    # If no product IDs are configured, show warning
+    if not products:
+        logger.warning("No Polar product IDs configured. Payment functionality will be limited.")
+        products.append({
+            "id": "configuration_required",
+            "name": "Configuration Required",
+            "description": "Polar product IDs need to be configured",
+            "price": 0,
+            "currency": "USD",
+            "interval": "month",
+            "tier": "free",
+            "features": ["Configuration required"],
+            "disabled": True
+        })
+    
+    body = orjson.dumps({"products": products})
+    return ResponseCache.make_etag(body), body
+
 @router.get("/products")
-async def list_products():
+async def list_products(request: Request):
     """List available products and pricing"""
     try:
-        # Product configuration - uses environment variables for product IDs
-        products = []
-        
-        # Power User tier
-        if settings.polar_power_product_id:
-            products.append({
-                "id": settings.polar_power_product_id,
-                "name": "Power User",
-                "description": "Unlimited conversions, library, exports, and browser extension",
-                "price": 5,
-                "currency": "USD",
-                "interval": "month",
-                "tier": "power",
-                "features": [
-                    "Unlimited conversions",
-                    "Conversion library",
-                    "Advanced export (PDF, DOCX)",
-                    "Context templates",
-                    "Browser extension",
-                    "Priority conversion"
-                ]
-            })
-        
-        # Pro tier
-        if settings.polar_pro_product_id:
-            products.append({
-                "id": settings.polar_pro_product_id,
-                "name": "Pro",
-                "description": "AI integration, API access, and team features",
-                "price": 15,
-                "currency": "USD",
-                "interval": "month",
-                "tier": "pro",
-                "features": [
-                    "Everything in Power User",
-                    "MCP Server access",
-                    "API access",
-                    "Advanced context tools",
-                    "Team sharing",
-                    "Analytics dashboard",
-                    "Priority support"
-                ]
-            })
-        
-        # Enterprise tier (custom pricing)
-        if settings.polar_enterprise_product_id:
-            products.append({
-                "id": settings.polar_enterprise_product_id,
-                "name": "Enterprise",
-                "description": "Self-hosted, custom features, and dedicated support",
-                "price": None,  # Custom pricing
-                "currency": "USD",
-                "interval": "custom",
-                "tier": "enterprise",
-                "features": [
-                    "Self-hosted MCP server",
-                    "Custom rate limits",
-                    "SSO integration",
-                    "Custom features",
-                    "SLA guarantees",
-                    "Dedicated support"
-                ],
-                "contact_required": True
-            })
+        etag, body = _products_body()
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
         
-        # If no product IDs are configured, show warning
-        if not products:
-            logger.warning("No Polar product IDs configured. Payment functionality will be limited.")
-            products.append({
-                "id": "configuration_required",
-                "name": "Configuration Required",
-                "description": "Polar product IDs need to be configured",
-                "price": 0,
-                "currency": "USD",
-                "interval": "month",
-                "tier": "free",
-                "features": ["Configuration required"],
-                "disabled": True
-            })
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
         
-        return {"products": products}
+        return Response(content=body, media_type="application/json", headers=headers)
         
     except Exception as e:
         logger.error(f"Failed to list products: {e}")
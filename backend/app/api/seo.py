@@ -1,16 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import HTMLResponse, PlainTextResponse, Response, RedirectResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, func
+from sqlalchemy.orm import Session, undefer
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import and_, desc
 from app.db.database import get_db
 from app.models import Conversion, ContextStack
 from app.services.bot_detection import bot_detector
+from app.services.cache import page_cache, sitemap_cache
+from app.services.conversion import render_markdown
+from app.services.counter_buffer import counter_buffer
 from app.core.config import settings
+from typing import Optional
 import logging
-import json
+import orjson
+from html import escape
+from string import Template
 from datetime import datetime, timezone
 from urllib.parse import quote_plus
 from xml.etree.ElementTree import Element, SubElement, tostring
+from xml.sax.saxutils import escape as xml_escape
 import xml.etree.ElementTree as ET
 import uuid
 
@@ -27,61 +35,84 @@ async def redirect_read_to_page(slug: str):
         status_code=status.HTTP_301_MOVED_PERMANENTLY
     )
 
-@router.get("/page/{slug}")
-async def get_conversion_page(
+# Shared by the sitemap and the context XML export
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# Set appropriate headers for crawlers
+MARKDOWN_PAGE_HEADERS = {
+    "Content-Type": "text/plain; charset=utf-8",
+    "Cache-Control": "public, max-age=3600, stale-while-revalidate=86400",
+    "X-Robots-Tag": "index, follow",
+    "X-Content-Type": "markdown"
+}
+
+HTML_PAGE_HEADERS = {
+    "Cache-Control": "public, max-age=3600, stale-while-revalidate=86400",
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-Robots-Tag": "index, follow"
+}
+
+# Registered before /page/{slug}, whose {slug} would otherwise also match "x.md"
+@router.get("/page/{slug}.md")
+def get_conversion_markdown(
     slug: str,
     request: Request,
     db: Session = Depends(get_db)
 ):
     """
-    Serve conversion as SEO-optimized page
+    Serve conversion as markdown for bots and LLM tools
     """
     try:
-        # Get conversion by slug
-        conversion = db.query(Conversion).filter(
-            and_(
-                Conversion.slug == slug,
-                Conversion.is_public == True
-            )
-        ).first()
-        
-        if not conversion:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Page not found"
-            )
-        
-        # Increment view count
-        conversion.view_count += 1
-        db.commit()
+        response = serve_cached_conversion_page(db, slug, request, markdown=True)
+        bot_detector.log_bot_access(request.headers.get("user-agent"), slug, True)
+        return response
         
-        # Check if bot/crawler for content type decision
-        user_agent = request.headers.get("user-agent")
-        if bot_detector.should_serve_markdown(user_agent):
-            bot_detector.log_bot_access(user_agent, slug, True)
-            return await serve_markdown_content(conversion, request)
-        else:
-            return await serve_html_content(conversion, request)
-            
     except Exception as e:
-        logger.error(f"Error serving conversion page {slug}: {str(e)}")
+        logger.error(f"Error serving conversion markdown {slug}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to load page"
+            detail="Failed to load markdown"
         )
 
-@router.get("/page/{slug}.md")
-async def get_conversion_markdown(
+@router.get("/page/{slug}")
+def get_conversion_page(
     slug: str,
     request: Request,
     db: Session = Depends(get_db)
 ):
     """
-    Serve conversion as markdown
+    Serve conversion as SEO-optimized page. The body does not depend on the
+    User-Agent, so shared caches can key on the URL alone; crawlers that want
+    markdown follow the rel="alternate" link to /page/{slug}.md
     """
     try:
-        # Get conversion by slug
-        conversion = db.query(Conversion).filter(
+        response = serve_cached_conversion_page(db, slug, request, markdown=False)
+        
+        # Buffer the view instead of committing on every page load
+        counter_buffer.bump("view", slug)
+        return response
+            
+    except Exception as e:
+        logger.error(f"Error serving conversion page {slug}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to load page"
+        )
+
+def serve_cached_conversion_page(db: Session, slug: str, request: Request, markdown: bool) -> Response:
+    """
+    Serve a rendered conversion page from page_cache, loading and rendering it
+    only on a miss. Entries are dropped when the conversion is saved or deleted.
+    """
+    key = f"{slug}:{'md' if markdown else 'html'}"
+    cached = page_cache.get(key)
+    
+    if cached is None:
+        query = db.query(Conversion)
+        if not markdown:
+            query = query.options(undefer(Conversion.content_html))
+        conversion = query.filter(
             and_(
                 Conversion.slug == slug,
                 Conversion.is_public == True
@@ -94,16 +125,20 @@ async def get_conversion_markdown(
                 detail="Page not found"
             )
         
-        return await serve_markdown_content(conversion, request)
-        
-    except Exception as e:
-        logger.error(f"Error serving conversion markdown {slug}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to load markdown"
-        )
+        render = serve_markdown_content if markdown else serve_html_content
+        cached = page_cache.set(key, render(conversion, request).body)
+    
+    etag, body = cached
+    headers = {**(MARKDOWN_PAGE_HEADERS if markdown else HTML_PAGE_HEADERS), "ETag": etag}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if markdown:
+        return PlainTextResponse(content=body, headers=headers, media_type="text/plain")
+    return HTMLResponse(content=body, headers=headers)
 
-async def serve_markdown_content(conversion: Conversion, request: Request) -> PlainTextResponse:
+def serve_markdown_content(conversion: Conversion, request: Request) -> PlainTextResponse:
     """Serve raw markdown content for bots and crawlers"""
     
     # Calculate reading time if not available
@@ -147,92 +182,68 @@ canonical_url: "https://ctxt.help/page/{conversion.slug}"
 *This content is optimized for AI and LLM consumption while preserving the original article structure and information.*
 """
     
-    # Set appropriate headers for crawlers
-    headers = {
-        "Content-Type": "text/plain; charset=utf-8",
-        "Cache-Control": "public, max-age=3600",
-        "X-Robots-Tag": "index, follow",
-        "X-Content-Type": "markdown"
-    }
-    
     return PlainTextResponse(
         content=markdown_content,
-        headers=headers,
+        headers=MARKDOWN_PAGE_HEADERS,
         media_type="text/plain"
     )
 
-async def serve_html_content(conversion: Conversion, request: Request) -> HTMLResponse:
-    """Serve rich HTML content for human users"""
-    
-    # Calculate additional metadata
-    estimated_read_time = max(1, conversion.word_count // 200)
-    
-    # Format publish date
-    publish_date = conversion.created_at.strftime('%B %d, %Y')
-    
-    # Create meta description (truncated if needed)
-    meta_description = conversion.meta_description or conversion.content[:155] + "..."
-    if len(meta_description) > 155:
-        meta_description = meta_description[:152] + "..."
-    
-    # Generate structured data for SEO
-    structured_data = {
-        "@context": "https://schema.org",
-        "@type": "Article",
-        "headline": conversion.title,
-        "description": meta_description,
-        "url": f"https://ctxt.help/read/{conversion.slug}",
-        "datePublished": conversion.created_at.isoformat(),
-        "dateModified": conversion.updated_at.isoformat() if conversion.updated_at else conversion.created_at.isoformat(),
-        "author": {
-            "@type": "Organization",
-            "name": "ctxt.help"
-        },
-        "publisher": {
-            "@type": "Organization",
-            "name": "ctxt.help",
-            "url": "https://ctxt.help"
-        },
-        "wordCount": conversion.word_count,
-        "articleBody": conversion.content[:500] + "...",
-        "mainEntityOfPage": {
-            "@type": "WebPage",
-            "@id": f"https://ctxt.help/read/{conversion.slug}"
-        }
-    }
-    
-    html_content = f"""<!DOCTYPE html>
+# Parts of the JSON-LD blocks that are identical on every page
+ORGANIZATION_LD = {"@type": "Organization", "name": "ctxt.help"}
+PUBLISHER_LD = {**ORGANIZATION_LD, "url": "https://ctxt.help"}
+ARTICLE_LD = {
+    "@context": "https://schema.org",
+    "@type": "Article",
+    "author": ORGANIZATION_LD,
+    "publisher": PUBLISHER_LD
+}
+COLLECTION_LD = {
+    "@context": "https://schema.org",
+    "@type": "Collection",
+    "creator": ORGANIZATION_LD,
+    "publisher": PUBLISHER_LD
+}
+
+def json_ld(data: dict) -> str:
+    """Serialize structured data for a <script type="application/ld+json"> block"""
+    # "</" is escaped so page text cannot close the script element
+    return orjson.dumps(data).decode().replace("</", "<\\/")
+
+# Static page shell, parsed once at import; serve_html_content only substitutes
+# the per-conversion fields
+CONVERSION_PAGE_TEMPLATE = Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{conversion.title} | ctxt.help</title>
+    <title>$title | ctxt.help</title>
     
     <!-- SEO Meta Tags -->
-    <meta name="description" content="{meta_description}">
-    <meta name="keywords" content="markdown, converter, AI, LLM, context, {conversion.domain}">
+    <meta name="description" content="$meta_description">
+    <meta name="keywords" content="markdown, converter, AI, LLM, context, $domain">
     <meta name="author" content="ctxt.help">
     <meta name="robots" content="index, follow">
-    <link rel="canonical" href="https://ctxt.help/read/{conversion.slug}">
+    <link rel="canonical" href="https://ctxt.help/read/$slug">
+    <link rel="alternate" type="text/markdown" href="https://ctxt.help/page/$slug.md">
     
     <!-- Open Graph Meta Tags -->
-    <meta property="og:title" content="{conversion.title}">
-    <meta property="og:description" content="{meta_description}">
-    <meta property="og:url" content="https://ctxt.help/read/{conversion.slug}">
+    <meta property="og:title" content="$title">
+    <meta property="og:description" content="$meta_description">
+    <meta property="og:url" content="https://ctxt.help/read/$slug">
     <meta property="og:type" content="article">
     <meta property="og:site_name" content="ctxt.help">
-    <meta property="article:published_time" content="{conversion.created_at.isoformat()}">
+    <meta property="article:published_time" content="$published_time">
     <meta property="article:author" content="ctxt.help">
     
     <!-- Twitter Card Meta Tags -->
     <meta name="twitter:card" content="summary_large_image">
-    <meta name="twitter:title" content="{conversion.title}">
-    <meta name="twitter:description" content="{meta_description}">
-    <meta name="twitter:url" content="https://ctxt.help/read/{conversion.slug}">
+    <meta name="twitter:title" content="$title">
+    <meta name="twitter:description" content="$meta_description">
+    <meta name="twitter:url" content="https://ctxt.help/read/$slug">
     
     <!-- Structured Data -->
     <script type="application/ld+json">
-    {structured_data}
+    $structured_data
     </script>
     
     <!-- Tailwind CSS -->
@@ -240,47 +251,47 @@ async def serve_html_content(conversion: Conversion, request: Request) -> HTMLRe
     
     <!-- Custom Styles -->
     <style>
-        .content-container {{
+        .content-container {
             max-width: 800px;
             margin: 0 auto;
             line-height: 1.7;
-        }}
-        .content-container h1, .content-container h2, .content-container h3 {{
+        }
+        .content-container h1, .content-container h2, .content-container h3 {
             margin-top: 2rem;
             margin-bottom: 1rem;
-        }}
-        .content-container p {{
+        }
+        .content-container p {
             margin-bottom: 1rem;
-        }}
-        .content-container ul, .content-container ol {{
+        }
+        .content-container ul, .content-container ol {
             margin-bottom: 1rem;
             padding-left: 1.5rem;
-        }}
-        .content-container blockquote {{
+        }
+        .content-container blockquote {
             border-left: 4px solid #3b82f6;
             padding-left: 1rem;
             margin: 1rem 0;
             font-style: italic;
             background-color: #f8fafc;
-        }}
-        .content-container code {{
+        }
+        .content-container code {
             background-color: #f1f5f9;
             padding: 0.2rem 0.4rem;
             border-radius: 0.25rem;
             font-family: 'Courier New', monospace;
-        }}
-        .content-container pre {{
+        }
+        .content-container pre {
             background-color: #1e293b;
             color: #f1f5f9;
             padding: 1rem;
             border-radius: 0.5rem;
             overflow-x: auto;
             margin: 1rem 0;
-        }}
-        .content-container pre code {{
+        }
+        .content-container pre code {
             background-color: transparent;
             padding: 0;
-        }}
+        }
     </style>
 </head>
 <body class="bg-gray-50 min-h-screen">
@@ -290,7 +301,7 @@ async def serve_html_content(conversion: Conversion, request: Request) -> HTMLRe
             <div class="flex items-center justify-between">
                 <a href="https://ctxt.help" class="text-2xl font-bold text-blue-600">ctxt.help</a>
                 <div class="text-sm text-gray-600">
-                    <span>{conversion.view_count} views</span>
+                    <span>$view_count views</span>
                 </div>
             </div>
         </div>
@@ -301,17 +312,17 @@ async def serve_html_content(conversion: Conversion, request: Request) -> HTMLRe
         <article class="bg-white rounded-lg shadow-sm p-8">
             <!-- Article Header -->
             <header class="mb-8 pb-6 border-b border-gray-200">
-                <h1 class="text-4xl font-bold text-gray-900 mb-4">{conversion.title}</h1>
+                <h1 class="text-4xl font-bold text-gray-900 mb-4">$title</h1>
                 
                 <div class="flex flex-wrap items-center gap-4 text-sm text-gray-600 mb-4">
-                    <span>📅 {publish_date}</span>
-                    <span>🌐 <a href="{conversion.source_url}" class="text-blue-600 hover:underline" target="_blank" rel="noopener">{conversion.domain}</a></span>
-                    <span>📖 {conversion.word_count} words</span>
-                    <span>⏱️ {estimated_read_time} min read</span>
+                    <span>📅 $publish_date</span>
+                    <span>🌐 <a href="$source_url" class="text-blue-600 hover:underline" target="_blank" rel="noopener">$domain</a></span>
+                    <span>📖 $word_count words</span>
+                    <span>⏱️ $estimated_read_time min read</span>
                 </div>
                 
                 <div class="flex flex-wrap gap-2">
-                    <a href="{conversion.source_url}" 
+                    <a href="$source_url" 
                        class="inline-flex items-center px-3 py-1 bg-blue-100 text-blue-800 rounded-full text-xs hover:bg-blue-200 transition-colors"
                        target="_blank" rel="noopener">
                         🔗 View Original
@@ -329,14 +340,14 @@ async def serve_html_content(conversion: Conversion, request: Request) -> HTMLRe
 
             <!-- Article Content -->
             <div class="content-container prose prose-lg max-w-none">
-                <div id="markdown-content">{conversion.content}</div>
+                <div id="markdown-content">$content_html</div>
             </div>
             
             <!-- Article Footer -->
             <footer class="mt-12 pt-8 border-t border-gray-200">
                 <div class="text-sm text-gray-600">
-                    <p>This content was converted from <a href="{conversion.source_url}" class="text-blue-600 hover:underline" target="_blank" rel="noopener">{conversion.source_url}</a> using <a href="https://ctxt.help" class="text-blue-600 hover:underline">ctxt.help</a> - The LLM Context Builder.</p>
-                    <p class="mt-2">Permanent link: <span class="font-mono text-xs bg-gray-100 px-2 py-1 rounded">https://ctxt.help/read/{conversion.slug}</span></p>
+                    <p>This content was converted from <a href="$source_url" class="text-blue-600 hover:underline" target="_blank" rel="noopener">$source_url</a> using <a href="https://ctxt.help" class="text-blue-600 hover:underline">ctxt.help</a> - The LLM Context Builder.</p>
+                    <p class="mt-2">Permanent link: <span class="font-mono text-xs bg-gray-100 px-2 py-1 rounded">https://ctxt.help/read/$slug</span></p>
                 </div>
             </footer>
         </article>
@@ -368,10 +379,10 @@ async def serve_html_content(conversion: Conversion, request: Request) -> HTMLRe
 
     <!-- JavaScript -->
     <script>
-        function copyToClipboard() {{
-            navigator.clipboard.writeText(window.location.href).then(() => {{
+        function copyToClipboard() {
+            navigator.clipboard.writeText(window.location.href).then(() => {
                 alert('Link copied to clipboard!');
-            }}).catch(() => {{
+            }).catch(() => {
                 // Fallback for older browsers
                 const textArea = document.createElement('textarea');
                 textArea.value = window.location.href;
@@ -380,60 +391,74 @@ async def serve_html_content(conversion: Conversion, request: Request) -> HTMLRe
                 document.execCommand('copy');
                 document.body.removeChild(textArea);
                 alert('Link copied to clipboard!');
-            }});
-        }}
+            });
+        }
         
-        function shareContent() {{
-            if (navigator.share) {{
-                navigator.share({{
+        function shareContent() {
+            if (navigator.share) {
+                navigator.share({
                     title: document.title,
                     url: window.location.href
-                }});
-            }} else {{
+                });
+            } else {
                 copyToClipboard();
-            }}
-        }}
-        
-        // Simple markdown to HTML conversion for content
-        document.addEventListener('DOMContentLoaded', function() {{
-            const content = document.getElementById('markdown-content');
-            let html = content.innerHTML;
-            
-            // Convert markdown headers
-            html = html.replace(/^### (.*$)/gim, '<h3>$1</h3>');
-            html = html.replace(/^## (.*$)/gim, '<h2>$1</h2>');
-            html = html.replace(/^# (.*$)/gim, '<h1>$1</h1>');
-            
-            // Convert bold
-            html = html.replace(/\\*\\*(.*?)\\*\\*/gim, '<strong>$1</strong>');
-            
-            // Convert italic
-            html = html.replace(/\\*(.*?)\\*/gim, '<em>$1</em>');
-            
-            // Convert links
-            html = html.replace(/\\[([^\\]]+)\\]\\(([^)]+)\\)/gim, '<a href="$2" class="text-blue-600 hover:underline" target="_blank" rel="noopener">$1</a>');
-            
-            // Convert line breaks to paragraphs
-            html = html.replace(/\n\n/gim, '</p><p>');
-            html = '<p>' + html + '</p>';
-            
-            content.innerHTML = html;
-        }});
+            }
+        }
+
     </script>
 </body>
-</html>"""
+</html>""")
+
+def serve_html_content(conversion: Conversion, request: Request) -> HTMLResponse:
+    """Serve rich HTML content for human users"""
     
-    return HTMLResponse(
-        content=html_content,
-        headers={
-            "Cache-Control": "public, max-age=3600",
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-Robots-Tag": "index, follow"
+    # reading_time is stored at write time; only legacy rows compute it here
+    estimated_read_time = conversion.reading_time or max(1, conversion.word_count // 200)
+    
+    # Format publish date
+    publish_date = conversion.created_at.strftime('%B %d, %Y')
+    
+    # Create meta description (truncated if needed)
+    meta_description = conversion.meta_description or conversion.content[:155] + "..."
+    if len(meta_description) > 155:
+        meta_description = meta_description[:152] + "..."
+    
+    # Generate structured data for SEO
+    structured_data = {
+        **ARTICLE_LD,
+        "headline": conversion.title,
+        "description": meta_description,
+        "url": f"https://ctxt.help/read/{conversion.slug}",
+        "datePublished": conversion.created_at.isoformat(),
+        "dateModified": conversion.updated_at.isoformat() if conversion.updated_at else conversion.created_at.isoformat(),
+        "wordCount": conversion.word_count,
+        "articleBody": conversion.content[:500] + "...",
+        "mainEntityOfPage": {
+            "@type": "WebPage",
+            "@id": f"https://ctxt.help/read/{conversion.slug}"
         }
+    }
+    
+    html_content = CONVERSION_PAGE_TEMPLATE.substitute(
+        title=escape(conversion.title or ""),
+        meta_description=escape(meta_description),
+        domain=escape(conversion.domain or ""),
+        slug=escape(conversion.slug),
+        published_time=conversion.created_at.isoformat(),
+        structured_data=json_ld(structured_data),
+        view_count=conversion.view_count,
+        publish_date=publish_date,
+        source_url=escape(conversion.source_url),
+        word_count=conversion.word_count,
+        estimated_read_time=estimated_read_time,
+        # Rendered (and escaped) by markdown-it at write time; older rows
+        # without content_html are rendered here
+        content_html=conversion.content_html or render_markdown(conversion.content)
     )
+    
+    return HTMLResponse(content=html_content, headers=HTML_PAGE_HEADERS)
 
-async def serve_context_html_content(context_stack: ContextStack, request: Request) -> HTMLResponse:
+def serve_context_html_content(context_stack: ContextStack, request: Request) -> HTMLResponse:
     """Serve rich HTML content for context stacks"""
     
     # Format publish date
@@ -481,29 +506,19 @@ async def serve_context_html_content(context_stack: ContextStack, request: Reque
     
     # Generate structured data for SEO
     structured_data = {
-        "@context": "https://schema.org",
-        "@type": "Collection",
+        **COLLECTION_LD,
         "name": context_stack.name,
         "description": meta_description,
         "url": f"https://ctxt.help/context/{str(context_stack.id)}",
         "dateCreated": context_stack.created_at.isoformat(),
         "dateModified": context_stack.updated_at.isoformat() if context_stack.updated_at else context_stack.created_at.isoformat(),
-        "creator": {
-            "@type": "Organization",
-            "name": "ctxt.help"
-        },
-        "publisher": {
-            "@type": "Organization", 
-            "name": "ctxt.help",
-            "url": "https://ctxt.help"
-        },
         "numberOfItems": len(context_stack.blocks) if context_stack.blocks else 0,
         "mainEntityOfPage": {
             "@type": "WebPage",
             "@id": f"https://ctxt.help/context/{str(context_stack.id)}"
         }
     }
-    structured_data_json = json.dumps(structured_data)
+    structured_data_json = json_ld(structured_data)
     
     html_content = f"""<!DOCTYPE html>
 <html lang="en">
@@ -745,7 +760,7 @@ async def serve_context_html_content(context_stack: ContextStack, request: Reque
         }
     )
 
-async def serve_context_markdown_content(context_stack: ContextStack, request: Request) -> PlainTextResponse:
+def serve_context_markdown_content(context_stack: ContextStack, request: Request) -> PlainTextResponse:
     """Serve raw markdown content for context stacks"""
     
     # Create markdown content
@@ -798,7 +813,7 @@ async def serve_context_markdown_content(context_stack: ContextStack, request: R
         media_type="text/plain"
     )
 
-async def serve_context_xml_content(context_stack: ContextStack, request: Request) -> Response:
+def serve_context_xml_content(context_stack: ContextStack, request: Request) -> Response:
     """Serve XML structured content for context stacks"""
     
     # Create XML structure
@@ -841,14 +856,11 @@ async def serve_context_xml_content(context_stack: ContextStack, request: Reques
     SubElement(source, 'url').text = f'https://ctxt.help/context/{str(context_stack.id)}'
     SubElement(source, 'description').text = 'The LLM Context Builder'
     
-    # Convert to XML string
-    xml_string = tostring(root, encoding='unicode', method='xml')
-    
-    # Add XML declaration and pretty formatting
-    formatted_xml = f'<?xml version="1.0" encoding="UTF-8"?>\n{xml_string}'
+    # Serialize straight to UTF-8 bytes behind the shared declaration
+    xml_bytes = XML_DECLARATION + tostring(root, encoding='utf-8', xml_declaration=False)
     
     return Response(
-        content=formatted_xml,
+        content=xml_bytes,
         media_type="application/xml",
         headers={
             "Cache-Control": "public, max-age=3600",
@@ -858,7 +870,7 @@ async def serve_context_xml_content(context_stack: ContextStack, request: Reques
     )
 
 @router.get("/context/{stack_id:uuid}")
-async def get_context_stack_page(
+def get_context_stack_page(
     stack_id: str,
     request: Request,
     db: Session = Depends(get_db)
@@ -884,18 +896,16 @@ async def get_context_stack_page(
                 detail="Context stack not found"
             )
         
-        # Increment use count
-        context_stack.use_count += 1
-        context_stack.last_used_at = func.now()
-        db.commit()
+        # Buffer the use instead of committing on every page load
+        counter_buffer.bump("use", context_stack.id)
         
         # Check if bot/crawler for content type decision
         user_agent = request.headers.get("user-agent")
         if bot_detector.should_serve_markdown(user_agent):
             bot_detector.log_bot_access(user_agent, str(context_stack.id), True)
-            return await serve_context_markdown_content(context_stack, request)
+            return serve_context_markdown_content(context_stack, request)
         else:
-            return await serve_context_html_content(context_stack, request)
+            return serve_context_html_content(context_stack, request)
             
     except ValueError:
         raise HTTPException(
@@ -910,7 +920,7 @@ async def get_context_stack_page(
         )
 
 @router.get("/context/{stack_id:uuid}.md")
-async def get_context_stack_markdown(
+def get_context_stack_markdown(
     stack_id: str,
     request: Request,
     db: Session = Depends(get_db)
@@ -936,7 +946,7 @@ async def get_context_stack_markdown(
                 detail="Context stack not found"
             )
         
-        return await serve_context_markdown_content(context_stack, request)
+        return serve_context_markdown_content(context_stack, request)
         
     except ValueError:
         raise HTTPException(
@@ -951,7 +961,7 @@ async def get_context_stack_markdown(
         )
 
 @router.get("/context/{stack_id:uuid}.xml")
-async def get_context_stack_xml(
+def get_context_stack_xml(
     stack_id: str,
     request: Request,
     db: Session = Depends(get_db)
@@ -977,7 +987,7 @@ async def get_context_stack_xml(
                 detail="Context stack not found"
             )
         
-        return await serve_context_xml_content(context_stack, request)
+        return serve_context_xml_content(context_stack, request)
         
     except ValueError:
         raise HTTPException(
@@ -991,25 +1001,57 @@ async def get_context_stack_xml(
             detail="Failed to load context stack"
         )
 
+SITEMAP_CACHE_KEY = "sitemap.xml"
+
 @router.get("/sitemap.xml")
 async def get_sitemap(db: Session = Depends(get_db)):
     """
     Generate XML sitemap for all public conversions and context stacks
     """
+    # Full-table scans and XML building run off the event loop
+    return await run_in_threadpool(build_sitemap_response, db)
+
+def build_sitemap_response(db: Session) -> Response:
+    """Serve the sitemap, rendering it only when the cached copy has expired"""
+    cached = sitemap_cache.get(SITEMAP_CACHE_KEY)
+    if cached is None:
+        cached = sitemap_cache.set(SITEMAP_CACHE_KEY, render_sitemap_xml(db))
+    
+    etag, body = cached
+    return Response(
+        content=body,
+        media_type="application/xml",
+        headers={
+            "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
+            "Content-Type": "application/xml; charset=utf-8",
+            "ETag": etag
+        }
+    )
+
+def render_sitemap_xml(db: Session) -> bytes:
+    """Query public content and render the sitemap XML document"""
     try:
-        # Create the root urlset element
-        urlset = Element('urlset')
-        urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
+        # One clock read for the whole render rather than one per row
+        now = datetime.now(timezone.utc)
+        today = now.strftime('%Y-%m-%d')
         
-        # Add homepage
-        homepage_url = SubElement(urlset, 'url')
-        SubElement(homepage_url, 'loc').text = 'https://ctxt.help/'
-        SubElement(homepage_url, 'changefreq').text = 'daily'
-        SubElement(homepage_url, 'priority').text = '1.0'
-        SubElement(homepage_url, 'lastmod').text = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        # Assemble the document as strings; an ElementTree would allocate several
+        # nodes per URL only to walk and re-escape them again in tostring()
+        parts = [
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            # Add homepage
+            '<url><loc>https://ctxt.help/</loc><changefreq>daily</changefreq>'
+            f'<priority>1.0</priority><lastmod>{today}</lastmod></url>'
+        ]
         
-        # Get all public and indexed conversions
-        conversions = db.query(Conversion).filter(
+        # Get all public and indexed conversions; only the sitemap columns, so
+        # content is never read and the covering index can answer the scan
+        conversions = db.query(
+            Conversion.slug,
+            Conversion.updated_at,
+            Conversion.created_at,
+            Conversion.view_count
+        ).filter(
             and_(
                 Conversion.is_public == True,
                 Conversion.is_indexed == True
@@ -1019,46 +1061,43 @@ async def get_sitemap(db: Session = Depends(get_db)):
         # Add conversion pages
         for conversion in conversions:
             # Calculate priority based on view count and recency
-            priority = calculate_conversion_priority(conversion)
+            priority = calculate_conversion_priority(conversion, now)
+            lastmod = (conversion.updated_at or conversion.created_at).strftime('%Y-%m-%d')
             
             # Add /page/{slug} route as the canonical URL
-            page_url = SubElement(urlset, 'url')
-            SubElement(page_url, 'loc').text = f'https://ctxt.help/page/{conversion.slug}'
-            SubElement(page_url, 'lastmod').text = (conversion.updated_at or conversion.created_at).strftime('%Y-%m-%d')
-            SubElement(page_url, 'changefreq').text = 'weekly'
-            SubElement(page_url, 'priority').text = f'{priority:.1f}'
+            parts.append(
+                f'<url><loc>https://ctxt.help/page/{xml_escape(conversion.slug)}</loc>'
+                f'<lastmod>{lastmod}</lastmod><changefreq>weekly</changefreq>'
+                f'<priority>{priority:.1f}</priority></url>'
+            )
         
-        # Get all public context stacks
-        context_stacks = db.query(ContextStack).filter(
+        # Get all public context stacks (sitemap columns only, blocks never read)
+        context_stacks = db.query(
+            ContextStack.id,
+            ContextStack.updated_at,
+            ContextStack.created_at,
+            ContextStack.use_count,
+            ContextStack.is_template,
+            ContextStack.last_used_at
+        ).filter(
             ContextStack.is_public == True
         ).order_by(desc(ContextStack.updated_at)).all()
         
         # Add context stack pages
         for stack in context_stacks:
             # Calculate priority based on usage
-            priority = calculate_context_stack_priority(stack)
+            priority = calculate_context_stack_priority(stack, now)
+            lastmod = (stack.updated_at or stack.created_at).strftime('%Y-%m-%d')
             
             # Add /context/{id} route as the canonical URL
-            context_url = SubElement(urlset, 'url')
-            SubElement(context_url, 'loc').text = f'https://ctxt.help/context/{stack.id}'
-            SubElement(context_url, 'lastmod').text = (stack.updated_at or stack.created_at).strftime('%Y-%m-%d')
-            SubElement(context_url, 'changefreq').text = 'weekly'
-            SubElement(context_url, 'priority').text = f'{priority:.1f}'
-        
-        # Convert to XML string
-        xml_string = tostring(urlset, encoding='unicode', method='xml')
-        
-        # Add XML declaration
-        sitemap_xml = f'<?xml version="1.0" encoding="UTF-8"?>\n{xml_string}'
+            parts.append(
+                f'<url><loc>https://ctxt.help/context/{stack.id}</loc>'
+                f'<lastmod>{lastmod}</lastmod><changefreq>weekly</changefreq>'
+                f'<priority>{priority:.1f}</priority></url>'
+            )
         
-        return Response(
-            content=sitemap_xml,
-            media_type="application/xml",
-            headers={
-                "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
-                "Content-Type": "application/xml; charset=utf-8"
-            }
-        )
+        parts.append('</urlset>')
+        return XML_DECLARATION + "".join(parts).encode()
         
     except Exception as e:
         logger.error(f"Error generating sitemap: {str(e)}")
@@ -1067,7 +1106,7 @@ async def get_sitemap(db: Session = Depends(get_db)):
             detail="Failed to generate sitemap"
         )
 
-def calculate_conversion_priority(conversion: Conversion) -> float:
+def calculate_conversion_priority(conversion: Conversion, now: Optional[datetime] = None) -> float:
     """
     Calculate sitemap priority for a conversion based on view count and recency
     Returns a value between 0.1 and 0.9
@@ -1085,7 +1124,7 @@ def calculate_conversion_priority(conversion: Conversion) -> float:
     
     # Boost for recent content
     if conversion.created_at:
-        days_old = (datetime.now(timezone.utc) - conversion.created_at).days
+        days_old = ((now or datetime.now(timezone.utc)) - conversion.created_at).days
         if days_old < 30:
             priority += 0.1
         elif days_old < 90:
@@ -1094,7 +1133,7 @@ def calculate_conversion_priority(conversion: Conversion) -> float:
     # Ensure priority is within valid range
     return min(max(priority, 0.1), 0.9)
 
-def calculate_context_stack_priority(stack: ContextStack) -> float:
+def calculate_context_stack_priority(stack: ContextStack, now: Optional[datetime] = None) -> float:
     """
     Calculate sitemap priority for a context stack based on usage
     Returns a value between 0.1 and 0.8
@@ -1116,7 +1155,7 @@ def calculate_context_stack_priority(stack: ContextStack) -> float:
     
     # Boost for recent activity
     if stack.last_used_at:
-        days_since_use = (datetime.now(timezone.utc) - stack.last_used_at).days
+        days_since_use = ((now or datetime.now(timezone.utc)) - stack.last_used_at).days
         if days_since_use < 7:
             priority += 0.1
         elif days_since_use < 30:
@@ -1125,12 +1164,8 @@ def calculate_context_stack_priority(stack: ContextStack) -> float:
     # Ensure priority is within valid range
     return min(max(priority, 0.1), 0.8)
 
-@router.get("/robots.txt")
-async def get_robots_txt():
-    """
-    Generate robots.txt file that references the sitemap with AI crawler controls
-    """
-    robots_content = f"""# Robots.txt for ctxt.help
+# robots.txt never varies; encode it once at import
+ROBOTS_TXT = """# Robots.txt for ctxt.help
 # Updated with AI crawler controls
 
 # Search engines - full access
@@ -1208,10 +1243,15 @@ Allow: /context/*.md
 
 # Additional directives
 Clean-param: utm_source&utm_medium&utm_campaign
-"""
-    
+""".encode()
+
+@router.get("/robots.txt")
+async def get_robots_txt():
+    """
+    Generate robots.txt file that references the sitemap with AI crawler controls
+    """
     return Response(
-        content=robots_content,
+        content=ROBOTS_TXT,
         media_type="text/plain",
         headers={
             "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
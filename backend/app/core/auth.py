@@ -1,20 +1,37 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Union
-from jose import JWTError, jwt
+from typing import Optional, Tuple, Union
+from uuid import UUID
+import jwt
+from jwt import InvalidTokenError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import Request
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 from app.core.config import settings
 from app.db.database import get_db
-from app.models import User
+from app.models import ApiKey, User
 from app.schemas import TokenData
+from collections import OrderedDict
+from threading import Lock
 import secrets
 import hashlib
+import hmac
+import time
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: argon2id for new hashes, bcrypt still verified and
+# upgraded to argon2 on the next successful login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism,
+)
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
@@ -23,36 +40,76 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and return a replacement hash when the stored one uses
+    a deprecated scheme or outdated parameters (None otherwise)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
-    to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.jwt_access_token_expire_minutes)
     
-    to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
-    return encoded_jwt
+    return jwt.encode(
+        {**data, "exp": expire, "type": "access"},
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm
+    )
 
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT refresh token"""
-    to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(days=settings.jwt_refresh_token_expire_days)
     
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
-    return encoded_jwt
+    return jwt.encode(
+        {**data, "exp": expire, "type": "refresh"},
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm
+    )
+
+# Verified tokens, so repeat requests with the same bearer token skip the
+# signature check. Entries never outlive the token's own exp claim.
+TOKEN_CACHE_TTL = 30  # seconds
+TOKEN_CACHE_MAXSIZE = 10000
+_token_cache: "OrderedDict[Tuple[str, str], Tuple[float, TokenData]]" = OrderedDict()
+_token_cache_lock = Lock()
+
+def _get_cached_token(token: str, token_type: str) -> Optional[TokenData]:
+    with _token_cache_lock:
+        entry = _token_cache.get((token, token_type))
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del _token_cache[(token, token_type)]
+            return None
+        return entry[1]
+
+def _cache_token(token: str, token_type: str, token_data: TokenData, exp: Optional[float]) -> None:
+    cache_until = time.time() + TOKEN_CACHE_TTL
+    if exp is not None:
+        cache_until = min(cache_until, exp)
+    with _token_cache_lock:
+        _token_cache[(token, token_type)] = (cache_until, token_data)
+        _token_cache.move_to_end((token, token_type))
+        while len(_token_cache) > TOKEN_CACHE_MAXSIZE:
+            _token_cache.popitem(last=False)
 
 def verify_token(token: str, token_type: str = "access") -> TokenData:
     """Verify and decode JWT token"""
+    cached = _get_cached_token(token, token_type)
+    if cached is not None:
+        return cached
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -71,13 +128,14 @@ def verify_token(token: str, token_type: str = "access") -> TokenData:
         if token_type_payload != token_type:
             raise credentials_exception
             
-        token_data = TokenData(user_id=user_id, email=email)
-    except JWTError:
+        token_data = TokenData(user_id=user_id, email=email, tier=payload.get("tier"))
+    except InvalidTokenError:
         raise credentials_exception
     
+    _cache_token(token, token_type, token_data, payload.get("exp"))
     return token_data
 
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
@@ -100,6 +158,25 @@ async def get_current_user(
     
     return user
 
+@dataclass(frozen=True)
+class TokenUser:
+    """Caller identity taken from verified access token claims"""
+    id: UUID
+    email: str
+    tier: Optional[str] = None
+
+def get_token_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> TokenUser:
+    """
+    Get the authenticated user from the access token alone, without loading
+    the User row. For endpoints that only need the caller's id; deactivation
+    takes effect when the access token expires. Use get_current_active_user
+    when the row itself is needed.
+    """
+    token_data = verify_token(credentials.credentials)
+    return TokenUser(id=token_data.user_id, email=token_data.email, tier=token_data.tier)
+
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Get current active user"""
     if not current_user.is_active:
@@ -109,55 +186,67 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
         )
     return current_user
 
-def generate_api_key() -> tuple[str, str, str]:
+API_KEY_PREFIX = "ctxt_"
+API_KEY_ID_LENGTH = 8
+
+def hash_api_key(key_part: str) -> bytes:
+    """Raw SHA-256 digest of the secret part of an API key, as stored"""
+    return hashlib.sha256(key_part.encode()).digest()
+
+def generate_api_key() -> tuple[str, str, bytes]:
     """Generate API key with prefix and hash"""
     # Generate random key
-    key_bytes = secrets.token_bytes(32)
     key = secrets.token_urlsafe(32)
     
     # Create prefix (first 8 characters)
-    prefix = f"ctxt_{key[:8]}"
+    prefix = f"{API_KEY_PREFIX}{key[:API_KEY_ID_LENGTH]}"
     
     # Create hash for storage
-    key_hash = hashlib.sha256(key.encode()).hexdigest()
+    key_hash = hash_api_key(key)
     
     # Full key for user (prefix + key)
     full_key = f"{prefix}_{key}"
     
     return full_key, prefix, key_hash
 
-def verify_api_key(api_key: str) -> str:
+def verify_api_key(api_key: str) -> bytes:
     """Verify API key format and return hash"""
-    if not api_key.startswith("ctxt_"):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid API key format"
-        )
-    
-    # Extract the key part (remove prefix)
-    try:
-        parts = api_key.split("_", 2)
-        if len(parts) != 3:
-            raise ValueError("Invalid key format")
-        key_part = parts[2]
-    except (IndexError, ValueError):
+    # ctxt_ + 8 id chars + _ + key; token_urlsafe output may itself contain
+    # underscores, so slice at fixed offsets rather than splitting on "_"
+    separator = len(API_KEY_PREFIX) + API_KEY_ID_LENGTH
+    if (
+        not api_key.startswith(API_KEY_PREFIX)
+        or len(api_key) <= separator + 1
+        or api_key[separator] != "_"
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key format"
         )
     
     # Return hash for database lookup
-    return hashlib.sha256(key_part.encode()).hexdigest()
+    return hash_api_key(api_key[separator + 1:])
 
-async def get_user_from_api_key(
+def get_user_from_api_key(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
     """Get user from API key for MCP endpoints"""
     api_key = credentials.credentials
     key_hash = verify_api_key(api_key)
+    prefix = api_key[:len(API_KEY_PREFIX) + API_KEY_ID_LENGTH]
     
-    user = db.query(User).filter(User.api_key == key_hash).first()
+    # Probe the prefix index, then compare digests in constant time so the
+    # response does not depend on how much of the hash matched
+    candidates = db.query(ApiKey.key_hash, User).join(User, ApiKey.user_id == User.id).filter(
+        ApiKey.prefix == prefix,
+        ApiKey.is_active == True,
+        or_(ApiKey.expires_at.is_(None), ApiKey.expires_at > func.now())
+    ).all()
+    user = next(
+        (user for stored_hash, user in candidates if hmac.compare_digest(stored_hash, key_hash)),
+        None
+    )
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -177,8 +266,9 @@ def create_tokens_for_user(user: User) -> dict:
     access_token_expires = timedelta(minutes=settings.jwt_access_token_expire_minutes)
     refresh_token_expires = timedelta(days=settings.jwt_refresh_token_expire_days)
     
+    # tier lets claims-only endpoints (get_token_user) skip the user lookup
     access_token = create_access_token(
-        data={"sub": str(user.id), "email": user.email},
+        data={"sub": str(user.id), "email": user.email, "tier": user.tier},
         expires_delta=access_token_expires
     )
     
@@ -193,7 +283,7 @@ def create_tokens_for_user(user: User) -> dict:
         "token_type": "bearer"
     }
 
-async def get_current_user_optional(
+def get_current_user_optional(
     request: Request,
     db: Session = Depends(get_db)
 ) -> Optional[User]:
@@ -1,6 +1,8 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 from typing import List, Optional, Union
+from functools import lru_cache
+from datetime import datetime, timedelta
 import os
 
 class Settings(BaseSettings):
@@ -16,6 +18,7 @@ class Settings(BaseSettings):
     
     # Redis
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+    counter_flush_interval: float = 1.0  # seconds between view/use count batch writes
     
     # Authentication
     jwt_secret_key: str = os.getenv("JWT_SECRET_KEY", "")
@@ -32,6 +35,11 @@ class Settings(BaseSettings):
     jwt_access_token_expire_minutes: int = 30
     jwt_refresh_token_expire_days: int = 7
     
+    # Password hashing (argon2id); lower these only for test suites
+    argon2_time_cost: int = 2
+    argon2_memory_cost: int = 19456  # KiB
+    argon2_parallelism: int = 1
+    
     # CORS
     allowed_origins: Union[str, List[str]] = ["http://localhost:5173", "http://localhost:3000"]
     
@@ -47,6 +55,12 @@ class Settings(BaseSettings):
     rate_limit_power_daily: str = "unlimited"
     rate_limit_pro_daily: str = "unlimited"
     
+    # Threads available to sync endpoints (anyio default is 40)
+    worker_threads: int = 64
+    
+    # Request bodies larger than this are rejected with 413 before parsing
+    max_request_body_size: int = 1_000_000  # bytes
+    
     # External APIs
     jina_reader_base_url: str = "https://r.jina.ai"
     jina_fallback_enabled: bool = True
@@ -81,8 +95,13 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = False
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """The process-wide Settings; .env and the environment are read only once."""
+    return Settings()
+
 # Create global settings instance
-settings = Settings()
+settings = get_settings()
 
 # Tier configurations
 TIER_CONFIGS = {
@@ -139,16 +158,37 @@ TIER_CONFIGS = {
     }
 }
 
+@lru_cache(maxsize=8)
 def get_tier_config(tier: str) -> dict:
     """Get configuration for a specific tier"""
     return TIER_CONFIGS.get(tier, TIER_CONFIGS["free"])
 
+# Hashed feature sets per tier; the lists above stay as the serializable form
+_TIER_FEATURE_SETS = {
+    tier: frozenset(config["features"]) for tier, config in TIER_CONFIGS.items()
+}
+
 def can_access_feature(tier: str, feature: str) -> bool:
     """Check if a tier has access to a specific feature"""
-    tier_config = get_tier_config(tier)
-    return feature in tier_config["features"]
+    return feature in _TIER_FEATURE_SETS.get(tier, _TIER_FEATURE_SETS["free"])
 
+@lru_cache(maxsize=8)
 def get_daily_limit(tier: str) -> Optional[int]:
     """Get daily conversion limit for a tier"""
     tier_config = get_tier_config(tier)
-    return tier_config["daily_limit"]
\ No newline at end of file
+    return tier_config["daily_limit"]
+
+
+# Next midnight UTC, recomputed only once the day rolls over
+_daily_reset_at = datetime.min
+
+
+def get_daily_reset_at() -> datetime:
+    """Get when daily quotas reset (next midnight UTC)"""
+    global _daily_reset_at
+    now = datetime.utcnow()
+    if now >= _daily_reset_at:
+        _daily_reset_at = now.replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+    return _daily_reset_at
@@ -1,8 +1,10 @@
 """Advanced configuration management system."""
 
+import copy
 import os
 import json
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 from app.core.config import settings
 from app.core.exceptions import ConfigurationError
@@ -10,13 +12,37 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Keys redacted by export_config, pre-split into their path segments
+SENSITIVE_KEYS: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(key.split('.')) for key in (
+        "auth.jwt_secret_key",
+        "database.url",
+        "payment.polar_access_token",
+        "payment.polar_webhook_secret",
+        "email.smtp_password",
+        "monitoring.sentry_dsn"
+    )
+)
+
+
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """Split a dotted configuration key into its path segments."""
+    return tuple(key.split('.'))
+
 
 class ConfigurationManager:
     """Advanced configuration manager for different environments."""
     
+    __slots__ = ("environment", "_config_cache", "_flat", "_derived_cache")
+    
     def __init__(self):
         self.environment = settings.environment
         self._config_cache: Dict[str, Any] = {}
+        # Every dotted path (and prefix) -> value, so get() is one dict lookup
+        self._flat: Dict[str, Any] = {}
+        # Section dicts built by the get_*_config helpers, dropped on any change
+        self._derived_cache: Dict[str, Dict[str, Any]] = {}
         self._load_configuration()
     
     def _load_configuration(self) -> None:
@@ -27,6 +53,7 @@ class ConfigurationManager:
             
             # Load environment-specific configuration
             self._load_environment_config()
+            self._reindex()
             
             # Validate critical configurations
             self._validate_configuration()
@@ -39,7 +66,12 @@ class ConfigurationManager:
     
     def _load_base_config(self) -> None:
         """Load base configuration settings."""
-        self._config_cache.update({
+        self._config_cache.update(self.build_base_config())
+    
+    @staticmethod
+    def build_base_config() -> Dict[str, Any]:
+        """Base configuration from settings, before any environment file."""
+        return {
             "app": {
                 "name": settings.app_name,
                 "version": settings.version,
@@ -95,7 +127,7 @@ class ConfigurationManager:
             "monitoring": {
                 "sentry_dsn": settings.sentry_dsn
             }
-        })
+        }
     
     def _load_environment_config(self) -> None:
         """Load environment-specific configuration."""
@@ -105,70 +137,100 @@ class ConfigurationManager:
             try:
                 with open(config_file, 'r') as f:
                     env_config = json.load(f)
-                    self._merge_config(self._config_cache, env_config)
+                    self.merge_config(self._config_cache, env_config)
                     logger.info(f"Loaded environment config from {config_file}")
             except Exception as e:
                 logger.warning(f"Failed to load environment config: {str(e)}")
     
-    def _merge_config(self, base: Dict[str, Any], override: Dict[str, Any]) -> None:
-        """Recursively merge configuration dictionaries."""
-        for key, value in override.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._merge_config(base[key], value)
-            else:
-                base[key] = value
+    @staticmethod
+    def merge_config(base: Dict[str, Any], override: Dict[str, Any]) -> None:
+        """Merge configuration dictionaries, descending into nested sections."""
+        stack = [(base, override)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    stack.append((current, value))
+                else:
+                    target[key] = value
+    
+    def _reindex(self) -> None:
+        """Rebuild the flat dotted-key view of the nested configuration."""
+        flat: Dict[str, Any] = {}
+        
+        def walk(prefix: str, node: Dict[str, Any]) -> None:
+            for key, value in node.items():
+                path = f"{prefix}.{key}" if prefix else key
+                flat[path] = value
+                if isinstance(value, dict):
+                    walk(path, value)
+        
+        walk("", self._config_cache)
+        self._flat = flat
+        self._derived_cache.clear()
     
     def _validate_configuration(self) -> None:
         """Validate critical configuration settings."""
-        critical_configs = []
+        errors, warnings = self.validate_config(self._config_cache, self.environment)
+        for warning in warnings:
+            logger.warning(warning)
+        
+        if errors:
+            raise ConfigurationError(
+                f"Critical configuration errors: {'; '.join(errors)}"
+            )
+    
+    @staticmethod
+    def validate_config(config: Dict[str, Any], environment: str) -> Tuple[List[str], List[str]]:
+        """Check a nested configuration; returns (errors, warnings)."""
+        def get(key: str, default: Any = None) -> Any:
+            node: Any = config
+            for k in _split_key(key):
+                if not isinstance(node, dict) or k not in node:
+                    return default
+                node = node[k]
+            return node
+        
+        errors: List[str] = []
+        warnings: List[str] = []
         
         # Validate JWT secret key
-        jwt_secret = self.get("auth.jwt_secret_key")
+        jwt_secret = get("auth.jwt_secret_key")
         if not jwt_secret or len(jwt_secret) < 32:
-            critical_configs.append("JWT secret key must be at least 32 characters")
+            errors.append("JWT secret key must be at least 32 characters")
         
         # Validate database URL
-        if not self.get("database.url"):
-            critical_configs.append("Database URL is required")
+        if not get("database.url"):
+            errors.append("Database URL is required")
         
         # Validate Redis URL
-        if not self.get("redis.url"):
-            critical_configs.append("Redis URL is required")
+        if not get("redis.url"):
+            errors.append("Redis URL is required")
         
         # Environment-specific validations
-        if self.environment == "production":
+        if environment == "production":
             # Production-specific validations
-            if self.get("app.debug", False):
-                logger.warning("Debug mode is enabled in production")
+            if get("app.debug", False):
+                warnings.append("Debug mode is enabled in production")
             
-            if not self.get("monitoring.sentry_dsn"):
-                logger.warning("Sentry DSN not configured for production")
+            if not get("monitoring.sentry_dsn"):
+                warnings.append("Sentry DSN not configured for production")
             
             # Check if secure protocols are used
-            db_url = self.get("database.url", "")
+            db_url = get("database.url") or ""
             if db_url.startswith("postgresql://") and not db_url.startswith("postgresql+asyncpg://"):
-                logger.warning("Consider using asyncpg for better performance in production")
+                warnings.append("Consider using asyncpg for better performance in production")
         
-        if critical_configs:
-            raise ConfigurationError(
-                f"Critical configuration errors: {'; '.join(critical_configs)}"
-            )
+        return errors, warnings
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation."""
-        keys = key.split('.')
-        value = self._config_cache
-        
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        return self._flat.get(key, default)
     
     def set(self, key: str, value: Any) -> None:
         """Set configuration value using dot notation."""
-        keys = key.split('.')
+        keys = _split_key(key)
         config = self._config_cache
         
         for k in keys[:-1]:
@@ -177,56 +239,79 @@ class ConfigurationManager:
             config = config[k]
         
         config[keys[-1]] = value
+        self._reindex()
+    
+    def _derived(self, name: str, build) -> Dict[str, Any]:
+        """Build a derived config section once; shared until the config changes."""
+        section = self._derived_cache.get(name)
+        if section is None:
+            section = self._derived_cache[name] = build()
+        return section
     
     def get_database_config(self) -> Dict[str, Any]:
         """Get database configuration."""
-        return {
-            "url": self.get("database.url"),
-            "echo": self.get("database.sql_debug", False),
-            "pool_size": self.get("database.pool_size", 5),
-            "max_overflow": self.get("database.max_overflow", 10),
-            "pool_timeout": self.get("database.pool_timeout", 30)
-        }
+        return self._derived(
+            "database_config",
+            lambda: {
+                "url": self.get("database.url"),
+                "echo": self.get("database.sql_debug", False),
+                "pool_size": self.get("database.pool_size", 5),
+                "max_overflow": self.get("database.max_overflow", 10),
+                "pool_timeout": self.get("database.pool_timeout", 30)
+            }
+        )
     
     def get_redis_config(self) -> Dict[str, Any]:
         """Get Redis configuration."""
-        return {
-            "url": self.get("redis.url"),
-            "decode_responses": True,
-            "socket_timeout": self.get("redis.socket_timeout", 5),
-            "socket_connect_timeout": self.get("redis.socket_connect_timeout", 5),
-            "retry_on_timeout": True
-        }
+        return self._derived(
+            "redis_config",
+            lambda: {
+                "url": self.get("redis.url"),
+                "decode_responses": True,
+                "socket_timeout": self.get("redis.socket_timeout", 5),
+                "socket_connect_timeout": self.get("redis.socket_connect_timeout", 5),
+                "retry_on_timeout": True
+            }
+        )
     
     def get_cors_config(self) -> Dict[str, Any]:
         """Get CORS configuration."""
-        return {
-            "allow_origins": self.get("cors.allowed_origins", []),
-            "allow_credentials": self.get("cors.allow_credentials", True),
-            "allow_methods": self.get("cors.allow_methods", ["*"]),
-            "allow_headers": self.get("cors.allow_headers", ["*"]),
-            "max_age": self.get("cors.max_age", 3600)
-        }
+        return self._derived(
+            "cors_config",
+            lambda: {
+                "allow_origins": self.get("cors.allowed_origins", []),
+                "allow_credentials": self.get("cors.allow_credentials", True),
+                "allow_methods": self.get("cors.allow_methods", ["*"]),
+                "allow_headers": self.get("cors.allow_headers", ["*"]),
+                "max_age": self.get("cors.max_age", 3600)
+            }
+        )
     
     def get_rate_limit_config(self) -> Dict[str, Any]:
         """Get rate limiting configuration."""
-        return {
-            "free_daily": self.get("rate_limiting.free_daily", 5),
-            "power_daily": self.get("rate_limiting.power_daily", "unlimited"),
-            "pro_daily": self.get("rate_limiting.pro_daily", "unlimited"),
-            "enterprise_daily": self.get("rate_limiting.enterprise_daily", "unlimited"),
-            "window_size": self.get("rate_limiting.window_size", 86400)  # 24 hours
-        }
+        return self._derived(
+            "rate_limit_config",
+            lambda: {
+                "free_daily": self.get("rate_limiting.free_daily", 5),
+                "power_daily": self.get("rate_limiting.power_daily", "unlimited"),
+                "pro_daily": self.get("rate_limiting.pro_daily", "unlimited"),
+                "enterprise_daily": self.get("rate_limiting.enterprise_daily", "unlimited"),
+                "window_size": self.get("rate_limiting.window_size", 86400)  # 24 hours
+            }
+        )
     
     def get_feature_flags(self) -> Dict[str, bool]:
         """Get feature flags configuration."""
-        return {
-            "mcp_server_enabled": self.get("features.mcp_server_enabled", True),
-            "seo_pages_enabled": self.get("features.seo_pages_enabled", True),
-            "analytics_enabled": self.get("features.analytics_enabled", True),
-            "payment_enabled": bool(self.get("payment.polar_access_token")),
-            "email_enabled": bool(self.get("email.smtp_host"))
-        }
+        return self._derived(
+            "feature_flags",
+            lambda: {
+                "mcp_server_enabled": self.get("features.mcp_server_enabled", True),
+                "seo_pages_enabled": self.get("features.seo_pages_enabled", True),
+                "analytics_enabled": self.get("features.analytics_enabled", True),
+                "payment_enabled": bool(self.get("payment.polar_access_token")),
+                "email_enabled": bool(self.get("email.smtp_host"))
+            }
+        )
     
     def is_production(self) -> bool:
         """Check if running in production environment."""
@@ -240,33 +325,28 @@ class ConfigurationManager:
         """Check if running in testing environment."""
         return self.environment == "testing"
     
+    def _build_redacted(self) -> Dict[str, Any]:
+        """Copy of the configuration with every sensitive leaf redacted."""
+        config = copy.deepcopy(self._config_cache)
+        for *path, leaf in SENSITIVE_KEYS:
+            obj = config
+            try:
+                for k in path:
+                    obj = obj[k]
+                if leaf in obj:
+                    obj[leaf] = "***REDACTED***"
+            except (KeyError, TypeError):
+                continue
+        return config
+    
     def export_config(self, include_sensitive: bool = False) -> Dict[str, Any]:
         """Export configuration (optionally excluding sensitive data)."""
-        config = self._config_cache.copy()
+        if include_sensitive:
+            return self._config_cache.copy()
         
-        if not include_sensitive:
-            # Remove sensitive data
-            sensitive_keys = [
-                "auth.jwt_secret_key",
-                "database.url",
-                "payment.polar_access_token",
-                "payment.polar_webhook_secret",
-                "email.smtp_password",
-                "monitoring.sentry_dsn"
-            ]
-            
-            for key in sensitive_keys:
-                keys = key.split('.')
-                obj = config
-                try:
-                    for k in keys[:-1]:
-                        obj = obj[k]
-                    if keys[-1] in obj:
-                        obj[keys[-1]] = "***REDACTED***"
-                except (KeyError, TypeError):
-                    continue
-        
-        return config
+        # The redacted tree is built once per config change; hand out a copy
+        # so callers cannot edit the cached template
+        return copy.deepcopy(self._derived("redacted_export", self._build_redacted))
     
     def reload(self) -> None:
         """Reload configuration from files and environment."""
@@ -275,5 +355,15 @@ class ConfigurationManager:
         logger.info("Configuration reloaded")
 
 
-# Global configuration manager instance
-config_manager = ConfigurationManager()
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_config_manager() -> ConfigurationManager:
+    """Global configuration manager, built (and validated) on first use."""
+    return ConfigurationManager()
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from app.core.config_manager import config_manager` working
+    # without loading configuration at import time
+    if name == "config_manager":
+        return get_config_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
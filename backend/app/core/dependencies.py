@@ -1,7 +1,6 @@
 """Dependency injection container and providers."""
 
-from typing import Optional
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.services.conversion import ConversionService
@@ -16,44 +15,55 @@ logger = logging.getLogger(__name__)
 
 
 class ServiceContainer:
-    """Dependency injection container for services."""
+    """
+    Dependency injection container for services. Each service is built on
+    first access and then stored as a plain instance attribute.
+    """
     
-    def __init__(self):
-        self._conversion_service: Optional[ConversionService] = None
-        self._rate_limiter: Optional[RateLimiter] = None
-        self._auth_service: Optional[AuthService] = None
-        self._payment_service: Optional[PaymentService] = None
-        self._context_stack_service: Optional[ContextStackService] = None
+    @cached_property
+    def conversion_service(self) -> ConversionService:
+        """Shared conversion service instance."""
+        return ConversionService()
+    
+    @cached_property
+    def rate_limiter(self) -> RateLimiter:
+        """Shared rate limiter instance."""
+        return RateLimiter()
+    
+    @cached_property
+    def auth_service(self) -> AuthService:
+        """Shared auth service instance."""
+        return AuthService()
+    
+    @cached_property
+    def payment_service(self) -> PaymentService:
+        """Shared payment service instance."""
+        return PaymentService()
+    
+    @cached_property
+    def context_stack_service(self) -> ContextStackService:
+        """Shared context stack service instance."""
+        return ContextStackService()
     
     def get_conversion_service(self) -> ConversionService:
         """Get conversion service instance."""
-        if self._conversion_service is None:
-            self._conversion_service = ConversionService()
-        return self._conversion_service
+        return self.conversion_service
     
     def get_rate_limiter(self) -> RateLimiter:
         """Get rate limiter instance."""
-        if self._rate_limiter is None:
-            self._rate_limiter = RateLimiter()
-        return self._rate_limiter
+        return self.rate_limiter
     
     def get_auth_service(self) -> AuthService:
         """Get auth service instance."""
-        if self._auth_service is None:
-            self._auth_service = AuthService()
-        return self._auth_service
+        return self.auth_service
     
     def get_payment_service(self) -> PaymentService:
         """Get payment service instance."""
-        if self._payment_service is None:
-            self._payment_service = PaymentService()
-        return self._payment_service
+        return self.payment_service
     
     def get_context_stack_service(self) -> ContextStackService:
         """Get context stack service instance."""
-        if self._context_stack_service is None:
-            self._context_stack_service = ContextStackService()
-        return self._context_stack_service
+        return self.context_stack_service
 
 
 # Global service container instance
@@ -66,24 +76,24 @@ def get_service_container() -> ServiceContainer:
 # Dependency providers for FastAPI
 def get_conversion_service() -> ConversionService:
     """Dependency provider for conversion service."""
-    return get_service_container().get_conversion_service()
+    return get_service_container().conversion_service
 
 
 def get_rate_limiter() -> RateLimiter:
     """Dependency provider for rate limiter."""
-    return get_service_container().get_rate_limiter()
+    return get_service_container().rate_limiter
 
 
 def get_auth_service() -> AuthService:
     """Dependency provider for auth service."""
-    return get_service_container().get_auth_service()
+    return get_service_container().auth_service
 
 
 def get_payment_service() -> PaymentService:
     """Dependency provider for payment service."""
-    return get_service_container().get_payment_service()
+    return get_service_container().payment_service
 
 
 def get_context_stack_service() -> ContextStackService:
     """Dependency provider for context stack service."""
-    return get_service_container().get_context_stack_service()
\ No newline at end of file
+    return get_service_container().context_stack_service
\ No newline at end of file
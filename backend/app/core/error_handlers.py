@@ -1,9 +1,11 @@
 """Global error handlers for ctxt.help API."""
 
+import re
 import traceback
+from secrets import token_hex
 from typing import Union
 from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
+from app.core.responses import OrjsonResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from pydantic import ValidationError as PydanticValidationError
@@ -14,47 +16,61 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# IntegrityError messages we can explain to the client, matched in one pass
+_INTEGRITY_PATTERNS = re.compile(r"unique constraint|foreign key constraint", re.IGNORECASE)
+_INTEGRITY_MESSAGES = {
+    "unique constraint": "Resource already exists",
+    "foreign key constraint": "Referenced resource not found",
+}
 
-async def ctxt_exception_handler(request: Request, exc: CtxtException) -> JSONResponse:
+
+def _make_extra(request: Request, path: str, **fields) -> dict:
+    """Logging extras shared by every handler, plus handler-specific fields."""
+    return {"path": path, "method": request.method, **fields}
+
+
+async def ctxt_exception_handler(request: Request, exc: CtxtException) -> OrjsonResponse:
     """Handle custom ctxt.help exceptions."""
-    logger.warning(f"CtxtException: {exc.error_code} - {exc.detail}", extra={
-        "error_code": exc.error_code,
-        "context": exc.context,
-        "path": request.url.path,
-        "method": request.method
-    })
+    path = request.scope["path"]
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(
+            "CtxtException: %s - %s", exc.error_code, exc.detail,
+            extra=_make_extra(request, path, error_code=exc.error_code, context=exc.context)
+        )
     
-    return JSONResponse(
+    return OrjsonResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
             "error_code": exc.error_code,
             "context": exc.context,
-            "path": str(request.url.path)
+            "path": path
         }
     )
 
 
-async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: HTTPException) -> OrjsonResponse:
     """Handle FastAPI HTTP exceptions."""
-    logger.warning(f"HTTPException: {exc.status_code} - {exc.detail}", extra={
-        "status_code": exc.status_code,
-        "path": request.url.path,
-        "method": request.method
-    })
+    path = request.scope["path"]
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(
+            "HTTPException: %s - %s", exc.status_code, exc.detail,
+            extra=_make_extra(request, path, status_code=exc.status_code)
+        )
     
-    return JSONResponse(
+    return OrjsonResponse(
         status_code=exc.status_code,
         content={
             "detail": exc.detail,
             "error_code": "HTTP_ERROR",
-            "path": str(request.url.path)
+            "path": path
         }
     )
 
 
-async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> OrjsonResponse:
     """Handle request validation errors."""
+    path = request.scope["path"]
     errors = []
     for error in exc.errors():
         field = " -> ".join(str(loc) for loc in error["loc"])
@@ -65,85 +81,89 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "input": error.get("input")
         })
     
-    logger.warning(f"Validation error on {request.url.path}: {errors}")
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning("Validation error on %s: %s", path, errors, extra=_make_extra(request, path))
     
-    return JSONResponse(
+    return OrjsonResponse(
         status_code=422,
         content={
             "detail": "Input validation failed",
             "error_code": "VALIDATION_ERROR",
             "errors": errors,
-            "path": str(request.url.path)
+            "path": path
         }
     )
 
 
-async def database_exception_handler(request: Request, exc: SQLAlchemyError) -> JSONResponse:
+async def database_exception_handler(request: Request, exc: SQLAlchemyError) -> OrjsonResponse:
     """Handle database errors."""
+    path = request.scope["path"]
+    message = str(exc)
     error_msg = "Database operation failed"
     
     if isinstance(exc, IntegrityError):
-        error_msg = "Data integrity violation"
-        if "unique constraint" in str(exc).lower():
-            error_msg = "Resource already exists"
-        elif "foreign key constraint" in str(exc).lower():
-            error_msg = "Referenced resource not found"
+        match = _INTEGRITY_PATTERNS.search(message)
+        error_msg = _INTEGRITY_MESSAGES[match.group(0).lower()] if match else "Data integrity violation"
     
-    logger.error(f"Database error on {request.url.path}: {str(exc)}", extra={
-        "exception_type": type(exc).__name__,
-        "path": request.url.path,
-        "method": request.method
-    })
+    if logger.isEnabledFor(logging.ERROR):
+        logger.error(
+            "Database error on %s: %s", path, message,
+            extra=_make_extra(request, path, exception_type=type(exc).__name__)
+        )
     
     # Don't expose sensitive database details in production
     if settings.environment == "production":
         detail = error_msg
     else:
-        detail = f"{error_msg}: {str(exc)}"
+        detail = f"{error_msg}: {message}"
     
-    return JSONResponse(
+    return OrjsonResponse(
         status_code=500,
         content={
             "detail": detail,
             "error_code": "DATABASE_ERROR",
-            "path": str(request.url.path)
+            "path": path
         }
     )
 
 
-async def generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def generic_exception_handler(request: Request, exc: Exception) -> OrjsonResponse:
     """Handle unexpected exceptions."""
-    error_id = f"err_{int(request.receive.__hash__())}"  # Simple error ID
+    path = request.scope["path"]
+    error_id = f"err_{token_hex(6)}"
+    # Formatting the traceback walks every frame; only pay for it in debug
+    tb = "".join(traceback.TracebackException.from_exception(exc).format()) if settings.debug else None
     
-    logger.error(f"Unhandled exception [{error_id}] on {request.url.path}: {str(exc)}", extra={
-        "error_id": error_id,
-        "exception_type": type(exc).__name__,
-        "path": request.url.path,
-        "method": request.method,
-        "traceback": traceback.format_exc() if settings.debug else None
-    })
+    if logger.isEnabledFor(logging.ERROR):
+        logger.error(
+            "Unhandled exception [%s] on %s: %s", error_id, path, exc,
+            extra=_make_extra(
+                request, path,
+                error_id=error_id, exception_type=type(exc).__name__, traceback=tb
+            )
+        )
     
     # Different responses for different environments
     if settings.environment == "production":
-        return JSONResponse(
+        return OrjsonResponse(
             status_code=500,
             content={
                 "detail": "An unexpected error occurred",
                 "error_code": "INTERNAL_ERROR", 
                 "error_id": error_id,
-                "path": str(request.url.path)
+                "path": path
             }
         )
     else:
-        return JSONResponse(
+        return OrjsonResponse(
             status_code=500,
             content={
                 "detail": str(exc),
                 "error_code": "INTERNAL_ERROR",
                 "error_id": error_id,
                 "exception_type": type(exc).__name__,
-                "traceback": traceback.format_exc(),
-                "path": str(request.url.path)
+                "traceback": tb,
+                "path": path
             }
         )
 
@@ -87,6 +87,18 @@ class ConversionError(CtxtException):
         )
 
 
+class PayloadTooLargeError(CtxtException):
+    """Raised when a request body exceeds the configured size limit."""
+    
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Request body exceeds {max_bytes} bytes",
+            error_code="PAYLOAD_TOO_LARGE",
+            context={"max_bytes": max_bytes}
+        )
+
+
 class ResourceNotFoundError(CtxtException):
     """Raised when a requested resource is not found."""
     
@@ -0,0 +1,28 @@
+"""Primary key generation for ctxt.help models."""
+
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562).
+
+    The top 48 bits are the Unix timestamp in milliseconds and the next 12
+    bits carry sub-millisecond precision, so new keys land on the rightmost
+    B-tree leaf instead of scattering inserts across the whole index.
+    """
+    timestamp_ns = time.time_ns()
+    timestamp_ms, remainder_ns = divmod(timestamp_ns, 1_000_000)
+    sub_ms = (remainder_ns << 12) // 1_000_000
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+
+    value = (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | sub_ms << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return uuid.UUID(int=value)
@@ -0,0 +1,24 @@
+"""Keyset (cursor) pagination helpers for ctxt.help API."""
+
+import base64
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+from app.core.exceptions import ValidationError
+
+
+def encode_cursor(created_at: datetime, record_id: UUID) -> str:
+    """Encode the (created_at, id) position of the last row on a page."""
+    raw = f"{created_at.isoformat()}|{record_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, record_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(record_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError("Invalid pagination cursor", "cursor", cursor)
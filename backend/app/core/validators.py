@@ -1,28 +1,42 @@
 """Input validation utilities for ctxt.help API."""
 
 import re
+import string
 import urllib.parse
+from functools import lru_cache
 from typing import List, Optional, Any
 from urllib.parse import urlparse
 from pydantic import BaseModel, field_validator, Field
 from app.core.exceptions import ValidationError
 
+# Character whitelists, checked with frozenset.issuperset instead of a regex
+_SLUG_CHARS = frozenset(string.ascii_lowercase + string.digits + "-_")
+_API_KEY_NAME_CHARS = frozenset(string.ascii_letters + string.digits + string.whitespace + "-_.")
+
+# Patterns used on every validated request, compiled once
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PW_LETTER_RE = re.compile(r'[a-zA-Z]')
+_PW_DIGIT_RE = re.compile(r'\d')
+
+_ALLOWED_SCOPES = frozenset({"convert", "library", "context", "analytics"})
+_ALLOWED_TIERS = frozenset({"free", "power", "pro", "enterprise"})
+
 
 class URLValidator:
     """URL validation utilities."""
     
     # Allowed schemes for URL conversion
-    ALLOWED_SCHEMES = {"http", "https"}
+    ALLOWED_SCHEMES = frozenset({"http", "https"})
     
     # Blocked domains (can be extended)
-    BLOCKED_DOMAINS = {
+    BLOCKED_DOMAINS = frozenset({
         "localhost",
         "127.0.0.1",
         "0.0.0.0",
         "10.0.0.0/8",  # Private network
         "172.16.0.0/12",  # Private network
         "192.168.0.0/16",  # Private network
-    }
+    })
     
     @staticmethod
     def validate_url(url: str) -> str:
@@ -30,33 +44,36 @@ class URLValidator:
         if not url or not isinstance(url, str):
             raise ValidationError("URL is required and must be a string", "url", url)
         
-        url = url.strip()
-        
-        try:
-            parsed = urlparse(url)
-        except Exception:
-            raise ValidationError("Invalid URL format", "url", url)
-        
-        # Check scheme
-        if parsed.scheme.lower() not in URLValidator.ALLOWED_SCHEMES:
-            raise ValidationError(
-                f"URL scheme must be one of: {', '.join(URLValidator.ALLOWED_SCHEMES)}", 
-                "url", 
-                url
-            )
-        
-        # Check if hostname exists
-        if not parsed.netloc:
-            raise ValidationError("URL must have a valid hostname", "url", url)
-        
-        # Check for blocked domains (basic security)
-        hostname = parsed.hostname
-        if hostname and hostname.lower() in URLValidator.BLOCKED_DOMAINS:
-            raise ValidationError("URL domain is not allowed", "url", url)
-        
-        # Normalize URL
-        normalized = urllib.parse.urlunparse(parsed)
-        return normalized
+        return _normalize_url(url.strip())
+
+
+@lru_cache(maxsize=4096)
+def _normalize_url(url: str) -> str:
+    """Parse, check and normalize a stripped URL; resubmitted URLs hit the cache."""
+    try:
+        parsed = urlparse(url)
+    except Exception:
+        raise ValidationError("Invalid URL format", "url", url)
+    
+    # Check scheme
+    if parsed.scheme.lower() not in URLValidator.ALLOWED_SCHEMES:
+        raise ValidationError(
+            f"URL scheme must be one of: {', '.join(URLValidator.ALLOWED_SCHEMES)}", 
+            "url", 
+            url
+        )
+    
+    # Check if hostname exists
+    if not parsed.netloc:
+        raise ValidationError("URL must have a valid hostname", "url", url)
+    
+    # Check for blocked domains (basic security)
+    hostname = parsed.hostname
+    if hostname and hostname.lower() in URLValidator.BLOCKED_DOMAINS:
+        raise ValidationError("URL domain is not allowed", "url", url)
+    
+    # Normalize URL
+    return urllib.parse.urlunparse(parsed)
 
 
 class TextValidator:
@@ -70,7 +87,8 @@ class TextValidator:
                 raise ValidationError(f"{field_name} cannot be empty", field_name, text)
             return text
         
-        text_length = len(text.strip())
+        stripped = text.strip()
+        text_length = len(stripped)
         
         if text_length < min_length:
             raise ValidationError(
@@ -86,7 +104,7 @@ class TextValidator:
                 text
             )
         
-        return text.strip()
+        return stripped
     
     @staticmethod
     def validate_slug(slug: str) -> str:
@@ -104,7 +122,7 @@ class TextValidator:
             raise ValidationError("Slug must be no more than 100 characters long", "slug", slug)
         
         # Check format (alphanumeric, hyphens, underscores only)
-        if not re.match(r'^[a-z0-9\-_]+$', slug):
+        if not _SLUG_CHARS.issuperset(slug):
             raise ValidationError(
                 "Slug can only contain lowercase letters, numbers, hyphens, and underscores",
                 "slug", 
@@ -130,8 +148,7 @@ class EmailValidator:
         email = email.strip().lower()
         
         # Basic email regex
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
+        if not _EMAIL_RE.match(email):
             raise ValidationError("Invalid email format", "email", email)
         
         # Check length
@@ -150,7 +167,7 @@ class APIKeyValidator:
         name = TextValidator.validate_text_length(name, 1, 100, "API key name")
         
         # Check for valid characters
-        if not re.match(r'^[a-zA-Z0-9\s\-_\.]+$', name):
+        if not name or not _API_KEY_NAME_CHARS.issuperset(name):
             raise ValidationError(
                 "API key name can only contain letters, numbers, spaces, hyphens, underscores, and dots",
                 "name", 
@@ -162,20 +179,18 @@ class APIKeyValidator:
     @staticmethod
     def validate_scopes(scopes: List[str]) -> List[str]:
         """Validate API key scopes."""
-        allowed_scopes = {"convert", "library", "context", "analytics"}
-        
         if not scopes:
             raise ValidationError("At least one scope is required", "scopes", scopes)
         
-        invalid_scopes = set(scopes) - allowed_scopes
+        invalid_scopes = [scope for scope in scopes if scope not in _ALLOWED_SCOPES]
         if invalid_scopes:
             raise ValidationError(
-                f"Invalid scopes: {', '.join(invalid_scopes)}. Allowed: {', '.join(allowed_scopes)}",
+                f"Invalid scopes: {', '.join(dict.fromkeys(invalid_scopes))}. Allowed: {', '.join(_ALLOWED_SCOPES)}",
                 "scopes",
                 scopes
             )
         
-        return list(set(scopes))  # Remove duplicates
+        return list(dict.fromkeys(scopes))  # Remove duplicates, keeping order
 
 
 class PasswordValidator:
@@ -194,8 +209,8 @@ class PasswordValidator:
             raise ValidationError("Password must be no more than 128 characters long", "password")
         
         # Check for at least one letter and one number
-        has_letter = re.search(r'[a-zA-Z]', password)
-        has_number = re.search(r'\d', password)
+        has_letter = _PW_LETTER_RE.search(password)
+        has_number = _PW_DIGIT_RE.search(password)
         
         if not has_letter:
             raise ValidationError("Password must contain at least one letter", "password")
@@ -253,11 +268,9 @@ def validate_pagination(limit: int = 10, offset: int = 0) -> tuple[int, int]:
 
 def validate_tier(tier: str) -> str:
     """Validate user tier."""
-    allowed_tiers = {"free", "power", "pro", "enterprise"}
-    
-    if tier not in allowed_tiers:
+    if tier not in _ALLOWED_TIERS:
         raise ValidationError(
-            f"Invalid tier. Must be one of: {', '.join(allowed_tiers)}",
+            f"Invalid tier. Must be one of: {', '.join(_ALLOWED_TIERS)}",
             "tier",
             tier
         )
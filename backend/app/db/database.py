@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
@@ -29,6 +29,14 @@ def get_db() -> Session:
     finally:
         db.close()
 
+def warm_up_pool():
+    """Open the first pooled connection so no request pays for the connect"""
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning(f"Database warm-up failed: {e}")
+
 def create_database():
     """Create database tables"""
     try:
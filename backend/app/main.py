@@ -1,13 +1,22 @@
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse
+from sqlalchemy import func, select, text
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.core.error_handlers import setup_error_handlers
-from app.middleware.logging import LoggingMiddleware, SecurityHeadersMiddleware, RateLimitLogMiddleware
-from app.db.database import get_db, create_database
+from app.core.responses import OrjsonResponse
+from app.middleware.unified import UnifiedObservabilityMiddleware
+from app.middleware.body_limit import BodySizeLimitMiddleware
+from app.db.database import get_db, create_database, warm_up_pool
 from app.models import User, Conversion, ContextStack
+from app.services.counter_buffer import counter_buffer
+from app.services.redis_client import get_redis_client
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import anyio
 import os
+import time
 import logging
 
 # Setup logging
@@ -24,18 +33,16 @@ app = FastAPI(
     version=settings.version,
     docs_url="/docs",
     redoc_url="/redoc",
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=OrjsonResponse
 )
 
 # Add middleware in correct order (last added is executed first)
-# Security headers
-app.add_middleware(SecurityHeadersMiddleware)
+# Oversized bodies are rejected before anything reads them
+app.add_middleware(BodySizeLimitMiddleware, max_body_size=settings.max_request_body_size)
 
-# Rate limit logging
-app.add_middleware(RateLimitLogMiddleware)
-
-# Request logging
-app.add_middleware(LoggingMiddleware)
+# Request logging, rate limit logging and security headers
+app.add_middleware(UnifiedObservabilityMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -60,34 +67,71 @@ async def startup_event():
         except Exception as e:
             print(f"⚠️  Database initialization failed: {e}")
             print("⚠️  Continue without database for testing purposes")
+    
+    # Sync handlers (password hashing, DB work) run on anyio's worker threads;
+    # size the pool so logins don't queue behind each other
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.worker_threads
+    
+    # Connect to the database and Redis now rather than on the first request
+    await asyncio.gather(
+        run_in_threadpool(warm_up_pool),
+        run_in_threadpool(get_redis_client)
+    )
+    
+    # Periodically write buffered view/use counts to the database
+    app.state.counter_flush_task = asyncio.create_task(
+        counter_buffer.run_flush_loop(settings.counter_flush_interval)
+    )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered counters before the worker exits"""
+    task = getattr(app.state, "counter_flush_task", None)
+    if task:
+        task.cancel()
+    await run_in_threadpool(counter_buffer.flush_now)
+
+# Static API information; nothing in it changes while the process runs
+ROOT_PAYLOAD = {
+    "message": f"{settings.app_name}",
+    "version": settings.version,
+    "status": "running",
+    "environment": settings.environment,
+    "docs": "/docs",
+    "endpoints": {
+        "health": "/health",
+        "auth": "/api/auth",
+        "conversions": "/api/conversions",
+        "mcp": "/api/mcp",
+        "seo": "/read/{slug}"
+    }
+}
+
+# Load balancer probes and dashboards poll these; reuse results briefly
+HEALTH_CHECK_TTL = 1.0  # seconds
+STATS_TTL = 60.0  # seconds
+_health_cache = (0.0, None)  # (expires_at, db_status)
+_stats_cache = (0.0, None)  # (expires_at, stats)
 
 @app.get("/")
 async def root():
     """Root endpoint returning API information"""
-    return {
-        "message": f"{settings.app_name}",
-        "version": settings.version,
-        "status": "running",
-        "environment": settings.environment,
-        "docs": "/docs",
-        "endpoints": {
-            "health": "/health",
-            "auth": "/api/auth",
-            "conversions": "/api/conversions",
-            "mcp": "/api/mcp",
-            "seo": "/read/{slug}"
-        }
-    }
+    return ROOT_PAYLOAD
 
 @app.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+def health_check(db: Session = Depends(get_db)):
     """Health check endpoint with database connectivity"""
-    try:
-        # Test database connection
-        db.execute("SELECT 1")
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
+    global _health_cache
+    now = time.monotonic()
+    expires_at, db_status = _health_cache
+    if now >= expires_at:
+        try:
+            # Test database connection
+            db.execute(text("SELECT 1"))
+            db_status = "healthy"
+        except Exception as e:
+            db_status = f"error: {str(e)}"
+        _health_cache = (now + HEALTH_CHECK_TTL, db_status)
     
     return {
         "status": "healthy",
@@ -101,21 +145,28 @@ async def health_check(db: Session = Depends(get_db)):
         }
     }
 
+def _count(model, *criteria):
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
 @app.get("/stats")
-async def get_stats(db: Session = Depends(get_db)):
+def get_stats(db: Session = Depends(get_db)):
     """Public statistics endpoint"""
+    global _stats_cache
+    now = time.monotonic()
+    expires_at, stats = _stats_cache
+    if now < expires_at:
+        return stats
+    
     try:
-        user_count = db.query(User).count()
-        conversion_count = db.query(Conversion).count()
-        public_conversions = db.query(Conversion).filter(Conversion.is_public == True).count()
-        context_stacks = db.query(ContextStack).count()
-        
-        return {
-            "users": user_count,
-            "total_conversions": conversion_count,
-            "public_conversions": public_conversions,
-            "context_stacks": context_stacks
-        }
+        # All four counts in a single round trip
+        user_count, conversion_count, public_conversions, context_stacks = db.execute(
+            select(
+                _count(User),
+                _count(Conversion),
+                _count(Conversion, Conversion.is_public == True),
+                _count(ContextStack)
+            )
+        ).one()
     except Exception:
         return {
             "users": 0,
@@ -123,6 +174,15 @@ async def get_stats(db: Session = Depends(get_db)):
             "public_conversions": 0,
             "context_stacks": 0
         }
+    
+    stats = {
+        "users": user_count,
+        "total_conversions": conversion_count,
+        "public_conversions": public_conversions,
+        "context_stacks": context_stacks
+    }
+    _stats_cache = (now + STATS_TTL, stats)
+    return stats
 
 # API Routes
 try:
@@ -0,0 +1,50 @@
+"""Request body size limit middleware."""
+
+import logging
+from fastapi import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.error_handlers import ctxt_exception_handler
+from app.core.exceptions import PayloadTooLargeError
+
+logger = logging.getLogger(__name__)
+
+
+class BodySizeLimitMiddleware:
+    """
+    Pure ASGI middleware that rejects request bodies over `max_body_size`
+    with 413. A declared Content-Length is checked before the app runs;
+    chunked bodies are counted as they are received and abort the read
+    with PayloadTooLargeError, which the app's error handlers render.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_body_size:
+                    response = await ctxt_exception_handler(
+                        Request(scope), PayloadTooLargeError(self.max_body_size)
+                    )
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise PayloadTooLargeError(self.max_body_size)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,116 +0,0 @@
-"""Request logging and monitoring middleware."""
-
-import time
-import logging
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-import uuid
-
-logger = logging.getLogger(__name__)
-
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for request/response logging and monitoring."""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Generate request ID for tracing
-        request_id = str(uuid.uuid4())[:8]
-        
-        # Start timer
-        start_time = time.time()
-        
-        # Log request
-        logger.info(
-            f"[{request_id}] {request.method} {request.url.path}",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "query_params": str(request.query_params),
-                "client_ip": request.client.host if request.client else None,
-                "user_agent": request.headers.get("user-agent"),
-            }
-        )
-        
-        # Process request
-        try:
-            response = await call_next(request)
-        except Exception as e:
-            process_time = time.time() - start_time
-            logger.error(
-                f"[{request_id}] Request failed: {str(e)}",
-                extra={
-                    "request_id": request_id,
-                    "process_time": process_time,
-                    "exception": str(e),
-                    "exception_type": type(e).__name__,
-                }
-            )
-            raise
-        
-        # Calculate process time
-        process_time = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            f"[{request_id}] {response.status_code} - {process_time:.3f}s",
-            extra={
-                "request_id": request_id,
-                "status_code": response.status_code,
-                "process_time": process_time,
-            }
-        )
-        
-        # Add request ID and timing headers
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Process-Time"] = f"{process_time:.3f}"
-        
-        return response
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware for adding security headers."""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-        
-        # Content Security Policy (adjust as needed)
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self'; "
-            "connect-src 'self'"
-        )
-        
-        return response
-
-
-class RateLimitLogMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging rate limit information."""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Log rate limit violations
-        if response.status_code == 429:
-            logger.warning(
-                f"Rate limit exceeded for {request.url.path}",
-                extra={
-                    "path": request.url.path,
-                    "method": request.method,
-                    "client_ip": request.client.host if request.client else None,
-                    "status_code": 429,
-                }
-            )
-        
-        return response
\ No newline at end of file
@@ -1,20 +1,20 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, UUID, ForeignKey, Index
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, UUID, ForeignKey, Index, LargeBinary
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY
 from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
 from sqlalchemy import JSON
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from app.db.database import Base
-import uuid
+from app.core.ids import uuid7
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     email = Column(String(255), unique=True, nullable=False, index=True)
     hashed_password = Column(String, nullable=False)
     tier = Column(String(20), default="free", nullable=False)  # free, power, pro, enterprise
-    api_key = Column(String(64), unique=True, nullable=True, index=True)
+    api_key = Column(LargeBinary(32), unique=True, nullable=True, index=True)  # SHA-256 digest
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     
@@ -39,7 +39,7 @@ class User(Base):
 class Conversion(Base):
     __tablename__ = "conversions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     slug = Column(String(100), unique=True, nullable=False, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     
@@ -50,6 +50,8 @@ class Conversion(Base):
     
     # Content
     content = Column(Text, nullable=False)
+    # content pre-rendered for /page/{slug}; deferred so API reads never load it
+    content_html = deferred(Column(Text, nullable=True))
     
     # SEO and metadata
     meta_description = Column(String(200), nullable=True)
@@ -76,7 +78,7 @@ class Conversion(Base):
 class ContextStack(Base):
     __tablename__ = "context_stacks"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     
     # Basic info
@@ -104,13 +106,13 @@ class ContextStack(Base):
 class ApiKey(Base):
     __tablename__ = "api_keys"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     
     # Key information
-    key_hash = Column(String, nullable=False, unique=True, index=True)
+    key_hash = Column(LargeBinary(32), nullable=False, unique=True, index=True)  # SHA-256 digest
     name = Column(String(100), nullable=False)  # User-friendly name
-    prefix = Column(String(10), nullable=False)  # First few chars for identification
+    prefix = Column(String(16), nullable=False, index=True)  # ctxt_ + first 8 key chars, for lookup and display
     
     # Permissions and limits
     scopes = Column(JSON, nullable=False, default=lambda: [])  # ['convert', 'library', 'context']
@@ -128,6 +130,11 @@ class ApiKey(Base):
 # Performance indexes
 Index('idx_conversions_created_at', Conversion.created_at.desc())
 Index('idx_conversions_view_count', Conversion.view_count.desc())
-Index('idx_conversions_user_created', Conversion.user_id, Conversion.created_at.desc())
+Index('idx_conversions_user_created_id', Conversion.user_id, Conversion.created_at.desc(), Conversion.id.desc())
+Index('idx_conversions_slug_public', Conversion.slug, unique=True,
+      postgresql_where=Conversion.is_public == True, postgresql_include=['view_count'])
+Index('idx_conversions_public_updated', Conversion.updated_at.desc(),
+      postgresql_where=(Conversion.is_public == True) & (Conversion.is_indexed == True),
+      postgresql_include=['slug', 'created_at', 'view_count'])
 Index('idx_users_tier_created', User.tier, User.created_at.desc())
 Index('idx_context_stacks_user_created', ContextStack.user_id, ContextStack.created_at.desc())
\ No newline at end of file
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, EmailStr, HttpUrl, validator
+from pydantic import BaseModel, EmailStr, Field, HttpUrl, validator, field_validator
 from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from uuid import UUID
+from app.core.validators import EmailValidator, PasswordValidator
 
 # User Schemas
 class UserBase(BaseModel):
@@ -10,6 +11,18 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str
 
+    # Validated while the body is parsed; the validators raise the app's own
+    # ValidationError, so error responses keep their existing shape.
+    @field_validator('email')
+    @classmethod
+    def validate_email(cls, v):
+        return EmailValidator.validate_email(v)
+
+    @field_validator('password')
+    @classmethod
+    def validate_password(cls, v):
+        return PasswordValidator.validate_password(v)
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
@@ -39,6 +52,7 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     user_id: Optional[UUID] = None
     email: Optional[str] = None
+    tier: Optional[str] = None
 
 # Conversion Schemas
 class ConversionOptions(BaseModel):
@@ -91,11 +105,32 @@ class ConversionResponse(BaseModel):
     permanent_url: str
     seo_optimized: bool
 
+class ConversionListItem(BaseModel):
+    """Library listing entry; omits content, which list views never render"""
+    id: UUID
+    slug: str
+    user_id: Optional[UUID] = None
+    source_url: str
+    title: Optional[str] = None
+    domain: Optional[str] = None
+    meta_description: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None
+    token_count: Optional[int] = None
+    topics: Optional[List[str]] = None
+    is_public: bool = True
+    view_count: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
 class ConversionList(BaseModel):
-    items: List[Conversion]
-    total: int
+    items: List[ConversionListItem]
+    total: Optional[int] = None  # Only computed when include_total=true
     limit: int
-    offset: int
+    offset: int = 0
+    next_cursor: Optional[str] = None
 
 # Context Stack Schemas
 class ContextBlockBase(BaseModel):
@@ -138,7 +173,9 @@ class ContextStack(ContextStackBase):
 class ContextStackExport(BaseModel):
     format: Literal["xml", "markdown", "json"] = "xml"
     include_sources: bool = True
-    custom_wrapper: Optional[str] = None
+    # Used as the XML root element name, so it must be a valid tag
+    custom_wrapper: Optional[str] = Field(None, max_length=64, pattern=r"^[A-Za-z_][A-Za-z0-9_.-]*$")
+    stream: bool = False  # Send the body as a streamed download instead of JSON
 
 # SEO Page Schemas
 class SEOPageData(BaseModel):
@@ -2,19 +2,21 @@
 
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.services.base import CRUDService
-from app.models import User, ApiKey
+from app.models import User, ApiKey, Conversion
 from app.core.auth import (
-    verify_password, 
+    verify_and_update_password, 
     get_password_hash, 
     create_tokens_for_user,
     generate_api_key
 )
+from app.core.config import get_daily_limit, get_daily_reset_at
 from app.core.exceptions import AuthenticationError, ValidationError
 from app.core.validators import EmailValidator, PasswordValidator
 import logging
-import uuid
+from app.core.ids import uuid7
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +40,7 @@ class AuthService(CRUDService[User]):
         
         # Create new user
         user_data = {
-            "id": uuid.uuid4(),
+            "id": uuid7(),
             "email": validated_email,
             "hashed_password": get_password_hash(validated_password),
             "tier": "free",
@@ -66,12 +68,17 @@ class AuthService(CRUDService[User]):
         if not user:
             raise AuthenticationError("Invalid email or password")
         
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = verify_and_update_password(password, user.hashed_password)
+        if not verified:
             raise AuthenticationError("Invalid email or password")
         
         if not user.is_active:
             raise AuthenticationError("Account is inactive")
         
+        # Transparently migrate legacy bcrypt hashes to argon2
+        if new_hash:
+            user.hashed_password = new_hash
+        
         # Update last login
         user.last_login_at = datetime.utcnow()
         db.commit()
@@ -104,7 +111,7 @@ class AuthService(CRUDService[User]):
         
         # Create API key record
         api_key_data = {
-            "id": uuid.uuid4(),
+            "id": uuid7(),
             "user_id": user_id,
             "name": name,
             "prefix": prefix,
@@ -176,34 +183,26 @@ class AuthService(CRUDService[User]):
         if not user:
             return {}
         
-        # Calculate daily usage (last 24 hours)
-        yesterday = datetime.utcnow() - timedelta(days=1)
-        from app.models import Conversion
-        daily_conversions = db.query(Conversion).filter(
-            Conversion.user_id == user_id,
-            Conversion.created_at >= yesterday
-        ).count()
-        
-        # Calculate monthly usage (last 30 days)
-        month_ago = datetime.utcnow() - timedelta(days=30)
-        monthly_conversions = db.query(Conversion).filter(
+        # Daily (last 24 hours) and monthly (last 30 days) usage in one index range scan
+        now = datetime.utcnow()
+        yesterday = now - timedelta(days=1)
+        month_ago = now - timedelta(days=30)
+        daily_conversions, monthly_conversions = db.query(
+            func.count().filter(Conversion.created_at >= yesterday),
+            func.count()
+        ).filter(
             Conversion.user_id == user_id,
             Conversion.created_at >= month_ago
-        ).count()
+        ).one()
         
         # Get daily limit for user's tier
-        from app.core.config import get_daily_limit
         daily_limit = get_daily_limit(user.tier)
         quota_remaining = None
         reset_at = None
         
         if daily_limit:
             quota_remaining = max(0, daily_limit - daily_conversions)
-            # Reset at midnight UTC
-            tomorrow = datetime.utcnow().replace(
-                hour=0, minute=0, second=0, microsecond=0
-            ) + timedelta(days=1)
-            reset_at = tomorrow
+            reset_at = get_daily_reset_at()
         
         return {
             "daily_conversions": daily_conversions,
@@ -3,7 +3,7 @@
 from abc import ABC, abstractmethod
 from typing import TypeVar, Generic, Optional, List, Dict, Any
 from sqlalchemy.orm import Session
-from app.core.exceptions import DatabaseError
+from app.core.exceptions import DatabaseError, ExternalServiceError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -135,7 +135,5 @@ class ExternalService(BaseService):
     
     def _handle_external_error(self, error: Exception, operation: str) -> None:
         """Handle external service errors consistently."""
-        from app.core.exceptions import ExternalServiceError
-        
         self.logger.error(f"{self.service_name} error in {operation}: {str(error)}")
         raise ExternalServiceError(self.service_name, str(error))
\ No newline at end of file
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional, List, Dict
 import re
 import logging
@@ -129,6 +130,20 @@ class BotDetectionService:
             '|'.join(f'({pattern})' for pattern in self.BOT_PATTERNS),
             re.IGNORECASE
         )
+        
+        # All known-bot tokens in one alternation, so a user agent is scanned
+        # once in C instead of once per token
+        self._known_bot_names = {
+            pattern.lower(): bot_name
+            for bot_name, patterns in self.KNOWN_BOTS.items()
+            for pattern in patterns
+        }
+        self.known_bot_regex = re.compile(
+            '|'.join(re.escape(pattern) for pattern in self._known_bot_names)
+        )
+        
+        # Crawlers send the same few user agents over and over
+        self._identify = lru_cache(maxsize=4096)(self._identify)
     
     def is_bot(self, user_agent: Optional[str]) -> bool:
         """
@@ -165,6 +180,10 @@ class BotDetectionService:
         Returns:
             Dict containing bot detection results
         """
+        return dict(self._identify(user_agent))
+    
+    def _identify(self, user_agent: Optional[str]) -> Dict[str, any]:
+        """Uncached identify_bot; results are memoized per user agent"""
         if not user_agent:
             return {
                 'is_bot': False,
@@ -176,17 +195,17 @@ class BotDetectionService:
         user_agent_lower = user_agent.lower()
         
         # Check known bots first
-        for bot_name, patterns in self.KNOWN_BOTS.items():
-            for pattern in patterns:
-                if pattern.lower() in user_agent_lower:
-                    bot_type = self._classify_bot_type(bot_name)
-                    return {
-                        'is_bot': True,
-                        'bot_name': bot_name,
-                        'bot_type': bot_type,
-                        'confidence': 0.95,
-                        'user_agent': user_agent
-                    }
+        match = self.known_bot_regex.search(user_agent_lower)
+        if match:
+            bot_name = self._known_bot_names[match.group()]
+            bot_type = self._classify_bot_type(bot_name)
+            return {
+                'is_bot': True,
+                'bot_name': bot_name,
+                'bot_type': bot_type,
+                'confidence': 0.95,
+                'user_agent': user_agent
+            }
         
         # Check with regex patterns
         match = self.bot_regex.search(user_agent_lower)
@@ -243,7 +262,7 @@ class BotDetectionService:
         Returns:
             bool: True if should serve markdown, False for HTML
         """
-        detection_result = self.identify_bot(user_agent)
+        detection_result = self._identify(user_agent)
         
         if not detection_result['is_bot']:
             return False
@@ -260,7 +279,7 @@ class BotDetectionService:
     
     def log_bot_access(self, user_agent: Optional[str], slug: str, served_markdown: bool):
         """Log bot access for monitoring"""
-        detection_result = self.identify_bot(user_agent)
+        detection_result = self._identify(user_agent)
         
         if detection_result['is_bot']:
             logger.info(
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from typing import Optional, Tuple
+import time
+import redis
+from app.services.redis_client import get_redis_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """
+    Read-through cache for serialized response bodies with content-hash ETags.
+    Entries live in Redis when available, otherwise in a bounded in-process LRU.
+    """
+
+    def __init__(self, prefix: str, ttl: int = 300, maxsize: int = 1024):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._local: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        """Strong ETag derived from the response body"""
+        return f'"{blake2b(body, digest_size=16).hexdigest()}"'
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """Return (etag, body) for a cached entry, or None on a miss"""
+        client = get_redis_client()
+        if client is not None:
+            try:
+                value = client.get(self._key(key))
+            except redis.RedisError as e:
+                logger.warning(f"Cache GET failed for {key}: {e}")
+                value = None
+        else:
+            with self._lock:
+                entry = self._local.get(key)
+                if entry and entry[0] > time.monotonic():
+                    self._local.move_to_end(key)
+                    value = entry[1]
+                else:
+                    value = None
+                    self._local.pop(key, None)
+
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return etag.decode(), body
+
+    def set(self, key: str, body: bytes) -> Tuple[str, bytes]:
+        """Store a body and return (etag, body)"""
+        etag = self.make_etag(body)
+        value = etag.encode() + b"\n" + body
+
+        client = get_redis_client()
+        if client is not None:
+            try:
+                client.set(self._key(key), value, ex=self.ttl)
+            except redis.RedisError as e:
+                logger.warning(f"Cache SET failed for {key}: {e}")
+        else:
+            with self._lock:
+                self._local[key] = (time.monotonic() + self.ttl, value)
+                self._local.move_to_end(key)
+                while len(self._local) > self.maxsize:
+                    self._local.popitem(last=False)
+        return etag, body
+
+    def delete(self, key: str) -> None:
+        """Invalidate a single entry"""
+        with self._lock:
+            self._local.pop(key, None)
+        client = get_redis_client()
+        if client is not None:
+            try:
+                client.delete(self._key(key))
+            except redis.RedisError as e:
+                logger.warning(f"Cache DELETE failed for {key}: {e}")
+
+    def clear(self) -> None:
+        """Invalidate every entry under this cache's prefix"""
+        with self._lock:
+            self._local.clear()
+        client = get_redis_client()
+        if client is not None:
+            try:
+                keys = list(client.scan_iter(match=f"{self.prefix}:*", count=500))
+                if keys:
+                    client.delete(*keys)
+            except redis.RedisError as e:
+                logger.warning(f"Cache CLEAR failed for {self.prefix}: {e}")
+
+# Public conversion documents keyed by slug
+conversion_cache = ResponseCache("conv", ttl=300)
+
+# Rendered sitemap.xml; crawlers hit it often and it changes slowly
+sitemap_cache = ResponseCache("sitemap", ttl=1800, maxsize=1)
+
+# Rendered /page/{slug} bodies keyed by "{slug}:{kind}"
+page_cache = ResponseCache("page", ttl=300, maxsize=256)
+PAGE_KINDS = ("html", "md")
+
+def invalidate_conversion(slug: str) -> None:
+    """Drop every cached representation of a conversion after it changes"""
+    conversion_cache.delete(slug)
+    for kind in PAGE_KINDS:
+        page_cache.delete(f"{slug}:{kind}")
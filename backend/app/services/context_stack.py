@@ -1,12 +1,15 @@
 """Context stack service for managing context collections."""
 
 from typing import List, Dict, Any, Optional
+from xml.sax.saxutils import escape, quoteattr
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from app.services.base import CRUDService
 from app.models import ContextStack
 from app.core.exceptions import ResourceNotFoundError
+from app.services.counter_buffer import counter_buffer
 import json
-import uuid
+from app.core.ids import uuid7
 
 
 class ContextStackService(CRUDService[ContextStack]):
@@ -27,7 +30,7 @@ class ContextStackService(CRUDService[ContextStack]):
     ) -> ContextStack:
         """Create a new context stack."""
         context_stack_data = {
-            "id": uuid.uuid4(),
+            "id": uuid7(),
             "user_id": user_id,
             "name": name,
             "description": description,
@@ -137,29 +140,24 @@ class ContextStackService(CRUDService[ContextStack]):
     
     def delete_context_stack(self, db: Session, stack_id: str, user_id: str) -> bool:
         """Delete a context stack (user must own it)."""
-        context_stack = db.query(ContextStack).filter(
-            ContextStack.id == stack_id,
-            ContextStack.user_id == user_id
-        ).first()
+        deleted = db.execute(
+            delete(ContextStack)
+            .where(ContextStack.id == stack_id, ContextStack.user_id == user_id)
+            .returning(ContextStack.id)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
         
-        if not context_stack:
+        if deleted is None:
             return False
         
-        db.delete(context_stack)
         db.commit()
         
         self.logger.info(f"Context stack deleted: {stack_id}")
         return True
     
     def increment_use_count(self, db: Session, stack_id: str) -> None:
-        """Increment the use count for a context stack."""
-        from datetime import datetime
-        
-        context_stack = db.query(ContextStack).filter(ContextStack.id == stack_id).first()
-        if context_stack:
-            context_stack.use_count += 1
-            context_stack.last_used_at = datetime.utcnow()
-            db.commit()
+        """Increment the use count for a context stack (buffered, flushed in batches)."""
+        counter_buffer.bump("use", stack_id)
     
     def export_context_stack(
         self, 
@@ -200,27 +198,22 @@ class ContextStackService(CRUDService[ContextStack]):
         include_sources: bool
     ) -> str:
         """Export as XML format."""
-        if custom_wrapper:
-            content = f"<{custom_wrapper}>"
-        else:
-            content = "<context>"
+        wrapper = custom_wrapper or "context"
+        parts = [f"<{wrapper}>"]
         
         if stack.description:
-            content += f"\\n  <description>{stack.description}</description>"
+            parts.append(f"\n  <description>{escape(stack.description)}</description>")
             
         for i, block in enumerate(blocks):
+            content = escape(block.get('content') or '')
             if block.get('type') == 'url':
-                attrs = f'url="{block.get("url", "")}" title="{block.get("title", "Untitled")}"' if include_sources else ""
-                content += f"\\n  <source_{i+1} {attrs}>\\n    {block.get('content', '')}\\n  </source_{i+1}>"
+                attrs = f' url={quoteattr(block.get("url") or "")} title={quoteattr(block.get("title") or "Untitled")}' if include_sources else ""
+                parts.append(f"\n  <source_{i+1}{attrs}>\n    {content}\n  </source_{i+1}>")
             else:
-                content += f"\\n  <text_{i+1}>\\n    {block.get('content', '')}\\n  </text_{i+1}>"
+                parts.append(f"\n  <text_{i+1}>\n    {content}\n  </text_{i+1}>")
         
-        if custom_wrapper:
-            content += f"\\n</{custom_wrapper}>"
-        else:
-            content += "\\n</context>"
-            
-        return content
+        parts.append(f"\n</{wrapper}>")
+        return "".join(parts)
     
     def _export_as_json(
         self, 
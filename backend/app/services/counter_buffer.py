@@ -0,0 +1,188 @@
+import asyncio
+from collections import defaultdict
+from threading import Lock
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+from uuid import UUID
+import redis
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import Table, bindparam, column, update, values
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.db.database import SessionLocal
+from app.models import Conversion, ContextStack
+from app.services.redis_client import get_redis_client
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Counter(NamedTuple):
+    table: Table
+    key_column: str
+    count_column: str
+    timestamp_column: str
+    key_type: Callable[[str], Any] = str
+
+# Buffered counters by kind
+COUNTERS: Dict[str, Counter] = {
+    "view": Counter(Conversion.__table__, "slug", "view_count", "last_viewed_at"),
+    "use": Counter(ContextStack.__table__, "id", "use_count", "last_used_at", UUID),
+}
+
+class CounterBuffer:
+    """
+    Buffers hot-path counter increments (conversion views, context stack uses)
+    so reads never write to the database. Increments live in Redis when it is
+    reachable, otherwise in a process-local dict, and are flushed in one
+    statement per counter kind.
+    """
+
+    KEY_PREFIX = "cb"
+
+    def __init__(self):
+        self._local: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._lock = Lock()
+
+    def _redis_key(self, kind: str, key: str) -> str:
+        return f"{self.KEY_PREFIX}:{kind}:{key}"
+
+    def _dirty_set(self, kind: str) -> str:
+        return f"{self.KEY_PREFIX}:{kind}:dirty"
+
+    def bump(self, kind: str, key) -> int:
+        """Record one increment and return the count not yet flushed"""
+        key = str(key)
+        client = get_redis_client()
+        if client is not None:
+            try:
+                pipe = client.pipeline()
+                pipe.incr(self._redis_key(kind, key))
+                pipe.sadd(self._dirty_set(kind), key)
+                count, _ = pipe.execute()
+                return count + self._local.get((kind, key), 0)
+            except redis.RedisError as e:
+                logger.warning(f"Redis INCR failed for {kind}:{key}: {e}")
+        with self._lock:
+            self._local[(kind, key)] += 1
+            return self._local[(kind, key)]
+
+    def pending(self, kind: str, key) -> int:
+        """Increments recorded for key that have not reached the database yet"""
+        key = str(key)
+        count = self._local.get((kind, key), 0)
+        client = get_redis_client()
+        if client is not None:
+            try:
+                count += int(client.get(self._redis_key(kind, key)) or 0)
+            except redis.RedisError:
+                pass
+        return count
+
+    def _drain(self) -> Dict[str, Dict[str, int]]:
+        """Atomically take all buffered increments, grouped by kind"""
+        drained: Dict[str, Dict[str, int]] = defaultdict(dict)
+        with self._lock:
+            for (kind, key), count in self._local.items():
+                drained[kind][key] = count
+            self._local.clear()
+
+        client = get_redis_client()
+        if client is not None:
+            try:
+                for kind in COUNTERS:
+                    while True:
+                        keys = client.spop(self._dirty_set(kind), 500)
+                        if not keys:
+                            break
+                        pipe = client.pipeline()
+                        for key in keys:
+                            pipe.getdel(self._redis_key(kind, key.decode()))
+                        for key, value in zip(keys, pipe.execute()):
+                            if value:
+                                key = key.decode()
+                                drained[kind][key] = drained[kind].get(key, 0) + int(value)
+            except redis.RedisError as e:
+                logger.warning(f"Failed to drain counters from Redis: {e}")
+        return drained
+
+    def _restore(self, kind: str, counts: Dict[str, int]) -> None:
+        """Put counts back after a failed flush so increments are not lost"""
+        with self._lock:
+            for key, count in counts.items():
+                self._local[(kind, key)] += count
+
+    @staticmethod
+    def _write(db: Session, counter: Counter, counts: Dict[str, int]) -> None:
+        table = counter.table
+        key_col = table.c[counter.key_column]
+        count_col = table.c[counter.count_column]
+        rows = [(counter.key_type(key), delta) for key, delta in counts.items()]
+
+        if db.get_bind().dialect.name == "postgresql":
+            # UPDATE ... FROM (VALUES (key, delta), ...) AS v: one statement, one round-trip
+            deltas = values(
+                column("key", key_col.type),
+                column("delta", count_col.type),
+                name="v"
+            ).data(rows)
+            stmt = (
+                update(table)
+                .where(key_col == deltas.c.key)
+                .values({
+                    counter.count_column: count_col + deltas.c.delta,
+                    counter.timestamp_column: func.now()
+                })
+            )
+            db.execute(stmt)
+        else:
+            stmt = (
+                update(table)
+                .where(key_col == bindparam("b_key"))
+                .values({
+                    counter.count_column: count_col + bindparam("b_delta"),
+                    counter.timestamp_column: func.now()
+                })
+            )
+            db.execute(stmt, [{"b_key": key, "b_delta": delta} for key, delta in rows])
+
+    def flush(self, db: Session) -> int:
+        """Write all buffered increments; returns the number of rows touched"""
+        flushed = 0
+        for kind, counts in self._drain().items():
+            if not counts:
+                continue
+            try:
+                self._write(db, COUNTERS[kind], counts)
+                db.commit()
+                flushed += len(counts)
+            except Exception as e:
+                db.rollback()
+                self._restore(kind, counts)
+                logger.error(f"Failed to flush {kind} counters: {e}")
+
+        if flushed:
+            logger.debug(f"Flushed counters for {flushed} rows")
+        return flushed
+
+    def flush_now(self) -> int:
+        """Flush using a dedicated session (for background jobs)"""
+        db = SessionLocal()
+        try:
+            return self.flush(db)
+        finally:
+            db.close()
+
+    async def run_flush_loop(self, interval: float) -> None:
+        """Flush buffered increments every `interval` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self.flush_now)
+            except Exception as e:
+                logger.error(f"Counter flush loop error: {e}")
+
+    def reset(self) -> None:
+        """Discard all buffered increments"""
+        self._drain()
+
+# Singleton instance
+counter_buffer = CounterBuffer()
@@ -1,20 +1,96 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from threading import Lock
+from typing import Dict, Optional, Tuple
+import math
+import time
+import redis
 from sqlalchemy.orm import Session
 from app.models import User, Conversion
-from app.core.config import get_daily_limit
+from app.core.config import get_daily_limit, get_daily_reset_at
+from app.services.redis_client import get_redis_client
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Atomic token bucket: refill by elapsed time, then try to take one token.
+# KEYS[1] = bucket key; ARGV = capacity, refill rate (tokens/s), now (s)
+# Returns {allowed, tokens_left, seconds_until_next_token} (0 when full)
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+local next_token = 0
+if tokens < capacity then
+    next_token = math.ceil((math.floor(tokens) + 1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {allowed, math.floor(tokens), next_token}
+"""
+
 class RateLimiter:
     """Rate limiting service for conversions based on user tier"""
     
-    @staticmethod
-    def check_rate_limit(db: Session, user: Optional[User] = None) -> dict:
+    # A daily limit refills evenly over this window
+    WINDOW_SECONDS = 86400
+    MAX_DENIED = 10000
+    
+    def __init__(self):
+        self._script = None
+        # Keys Redis recently denied, with the monotonic time the denial expires;
+        # repeat requests inside that window are refused without a round-trip
+        self._denied: Dict[str, float] = {}
+        self._lock = Lock()
+    
+    def _take_token(self, client: redis.Redis, key: str, capacity: int) -> Tuple[bool, int, int]:
+        """Run the token bucket script; returns (allowed, remaining, seconds until next token)"""
+        with self._lock:
+            denied_until = self._denied.get(key)
+            if denied_until is not None:
+                if denied_until > time.monotonic():
+                    return False, 0, math.ceil(denied_until - time.monotonic())
+                del self._denied[key]
+        
+        if self._script is None:
+            # register_script uses EVALSHA and reloads the script on NOSCRIPT
+            self._script = client.register_script(TOKEN_BUCKET_LUA)
+        allowed, remaining, next_token = self._script(
+            keys=[f"rl:{key}"],
+            args=[capacity, capacity / self.WINDOW_SECONDS, time.time()],
+            client=client
+        )
+        
+        if not allowed:
+            now = time.monotonic()
+            with self._lock:
+                if len(self._denied) >= self.MAX_DENIED:
+                    self._denied = {k: t for k, t in self._denied.items() if t > now}
+                self._denied[key] = now + next_token
+        return bool(allowed), int(remaining), int(next_token)
+    
+    def check_rate_limit(
+        self,
+        db: Session,
+        user: Optional[User] = None,
+        client_ip: Optional[str] = None
+    ) -> dict:
         """
         Check if user has exceeded their daily rate limit
         Returns: dict with allowed, remaining, reset_time info
+        
+        With Redis available this consumes one token from the caller's bucket,
+        which refills evenly over a day; reset_time is when the next token
+        arrives. Otherwise it counts the user's conversions from the last 24
+        hours and reset_time is the next midnight UTC.
         """
         if not user:
             # For anonymous users, use free tier limits
@@ -32,29 +108,30 @@ class RateLimiter:
                 "daily_limit": None,
                 "remaining": None,
                 "reset_time": None,
-                "current_usage": 0
+                "current_usage": 0,
+                "retry_after": None
             }
         
-        # Calculate usage in last 24 hours
-        yesterday = datetime.utcnow() - timedelta(days=1)
-        
-        if user:
-            current_usage = db.query(Conversion).filter(
-                Conversion.user_id == user.id,
-                Conversion.created_at >= yesterday
-            ).count()
-        else:
-            # For anonymous users, we can't track usage precisely
-            # Could implement IP-based tracking here if needed
-            current_usage = 0
-        
-        remaining = max(0, daily_limit - current_usage)
-        allowed = current_usage < daily_limit
+        retry_after = None
+        bucket_key = str(user.id) if user else client_ip
+        client = get_redis_client() if bucket_key else None
+        if client is not None:
+            try:
+                allowed, remaining, next_token = self._take_token(client, bucket_key, daily_limit)
+                current_usage = daily_limit - remaining
+                reset_time = datetime.utcnow() + timedelta(seconds=next_token)
+                if not allowed:
+                    retry_after = next_token
+            except redis.RedisError as e:
+                logger.warning(f"Redis rate limit check failed for {bucket_key}: {e}")
+                client = None
         
-        # Reset time is midnight UTC
-        reset_time = datetime.utcnow().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ) + timedelta(days=1)
+        if client is None:
+            current_usage = self._count_daily_usage(db, user)
+            remaining = max(0, daily_limit - current_usage)
+            allowed = current_usage < daily_limit
+            # Reset time is midnight UTC
+            reset_time = get_daily_reset_at()
         
         result = {
             "allowed": allowed,
@@ -62,7 +139,8 @@ class RateLimiter:
             "daily_limit": daily_limit,
             "remaining": remaining,
             "reset_time": reset_time.isoformat(),
-            "current_usage": current_usage
+            "current_usage": current_usage,
+            "retry_after": retry_after
         }
         
         if not allowed:
@@ -70,6 +148,23 @@ class RateLimiter:
         
         return result
     
+    @staticmethod
+    def _count_daily_usage(db: Session, user: Optional[User]) -> int:
+        """Conversions the user created in the last 24 hours"""
+        # Calculate usage in last 24 hours
+        yesterday = datetime.utcnow() - timedelta(days=1)
+        
+        if user:
+            current_usage = db.query(Conversion).filter(
+                Conversion.user_id == user.id,
+                Conversion.created_at >= yesterday
+            ).count()
+        else:
+            # For anonymous users, we can't track usage precisely
+            # Could implement IP-based tracking here if needed
+            current_usage = 0
+        return current_usage
+    
     @staticmethod
     def get_rate_limit_headers(rate_info: dict) -> dict:
         """
@@ -83,9 +178,12 @@ class RateLimiter:
         if rate_info["daily_limit"] is not None:
             headers.update({
                 "X-RateLimit-Limit": str(rate_info["daily_limit"]),
-                "X-RateLimit-Remaining": str(rate_info["remaining"]),
-                "X-RateLimit-Reset": rate_info["reset_time"]
+                "X-RateLimit-Remaining": str(rate_info["remaining"])
             })
+            if rate_info["reset_time"]:
+                headers["X-RateLimit-Reset"] = rate_info["reset_time"]
+            if rate_info.get("retry_after"):
+                headers["Retry-After"] = str(rate_info["retry_after"])
         else:
             headers.update({
                 "X-RateLimit-Limit": "unlimited",
@@ -0,0 +1,48 @@
+from threading import Lock
+from typing import Optional
+import math
+import time
+import redis
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[redis.Redis] = None
+# Monotonic time before which a failed connection is not retried
+_retry_at = 0.0
+_lock = Lock()
+
+# A worker that misses Redis at boot should not stay on local fallbacks for life
+RETRY_INTERVAL = 30.0  # seconds
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """
+    Shared Redis connection, created on first use.
+    Returns None when Redis is not reachable so callers can fall back to
+    process-local state; a failed check is retried after RETRY_INTERVAL.
+    """
+    global _client, _retry_at
+    if _client is not None or time.monotonic() < _retry_at:
+        return _client
+    with _lock:
+        if _client is not None or time.monotonic() < _retry_at:
+            return _client
+        if not settings.redis_url:
+            _retry_at = math.inf
+            return None
+        try:
+            client = redis.Redis.from_url(
+                settings.redis_url,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5
+            )
+            client.ping()
+            _client = client
+            logger.info("Connected to Redis")
+        except redis.RedisError as e:
+            logger.warning(
+                f"Redis unavailable, using in-process fallbacks for {RETRY_INTERVAL:.0f}s: {e}"
+            )
+            _retry_at = time.monotonic() + RETRY_INTERVAL
+    return _client
@@ -1,5 +1,6 @@
 """Test configuration and fixtures."""
 
+import os
 import pytest
 import asyncio
 from typing import AsyncGenerator, Generator
@@ -9,11 +10,17 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.types import TypeDecorator, String
 
+# Cheap argon2 parameters; must be set before settings are first imported
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "8")
+
 from app.main import app
 from app.db.database import Base, get_db
 from app.core.config import settings
 from app.models import User, Conversion, ContextStack, ApiKey
 from app.core.auth import get_password_hash, create_tokens_for_user
+from app.services.counter_buffer import counter_buffer
+from app.services.cache import conversion_cache, page_cache, sitemap_cache
 import uuid
 
 # Test database URL - use in-memory SQLite for tests
@@ -86,8 +93,14 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    counter_buffer.reset()
+    conversion_cache.clear()
+    page_cache.clear()
+    sitemap_cache.clear()
     with TestClient(app) as test_client:
         yield test_client
+        # Drop buffered counts so shutdown doesn't flush them to the dev database
+        counter_buffer.reset()
     app.dependency_overrides.clear()
 
 @pytest.fixture
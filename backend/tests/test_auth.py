@@ -3,6 +3,10 @@
 import pytest
 from fastapi.testclient import TestClient
 from app.models import User
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from app.core.auth import pwd_context, create_tokens_for_user, verify_token, get_user_from_api_key
+from app.core.config import settings
 
 class TestUserRegistration:
     """Test user registration functionality."""
@@ -41,6 +45,26 @@ class TestUserRegistration:
         })
         
         assert response.status_code == 422
+    
+    def test_register_weak_password(self, client: TestClient):
+        """Test password rules are enforced while parsing the body."""
+        response = client.post("/api/auth/register", json={
+            "email": "weak@example.com",
+            "password": "short"
+        })
+        
+        assert response.status_code == 422
+        assert response.json()["error_code"] == "VALIDATION_ERROR"
+    
+    def test_register_oversized_body(self, client: TestClient):
+        """Test oversized request bodies are rejected before parsing."""
+        response = client.post("/api/auth/register", json={
+            "email": "big@example.com",
+            "password": "x" * (settings.max_request_body_size + 1)
+        })
+        
+        assert response.status_code == 413
+        assert response.json()["error_code"] == "PAYLOAD_TOO_LARGE"
 
 class TestUserLogin:
     """Test user login functionality."""
@@ -58,6 +82,20 @@ class TestUserLogin:
         assert "refresh_token" in data
         assert data["user"]["email"] == test_user.email
     
+    def test_login_upgrades_bcrypt_hash(self, client: TestClient, test_user: User, db_session):
+        """Test legacy bcrypt hashes are rehashed with argon2 on login."""
+        test_user.hashed_password = pwd_context.hash("testpassword123", scheme="bcrypt")
+        db_session.commit()
+        
+        response = client.post("/api/auth/login", json={
+            "email": test_user.email,
+            "password": "testpassword123"
+        })
+        
+        assert response.status_code == 200
+        db_session.refresh(test_user)
+        assert test_user.hashed_password.startswith("$argon2id$")
+    
     def test_login_wrong_password(self, client: TestClient, test_user: User):
         """Test login with wrong password fails."""
         response = client.post("/api/auth/login", json={
@@ -100,6 +138,34 @@ class TestAuthenticatedEndpoints:
         assert "total_conversions" in data
         assert data["quota_remaining"] == 5  # Free tier daily limit
     
+    def test_get_usage_stats_counts_conversions(self, client: TestClient, auth_headers: dict, sample_conversion):
+        """Test daily and monthly usage are counted from the user's conversions."""
+        response = client.get("/api/auth/usage", headers=auth_headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["daily_conversions"] == 1
+        assert data["monthly_conversions"] == 1
+        assert data["quota_remaining"] == 4
+    
+    def test_verified_token_cache_respects_type(self, test_user: User):
+        """Test cached token verification still enforces the token type."""
+        tokens = create_tokens_for_user(test_user)
+        
+        first = verify_token(tokens["access_token"])
+        assert verify_token(tokens["access_token"]) is first
+        
+        with pytest.raises(HTTPException):
+            verify_token(tokens["access_token"], token_type="refresh")
+    
+    def test_access_token_carries_tier_claim(self, power_user: User):
+        """Test claims-only endpoints get the tier without a user lookup."""
+        tokens = create_tokens_for_user(power_user)
+        
+        token_data = verify_token(tokens["access_token"])
+        assert token_data.user_id == power_user.id
+        assert token_data.tier == "power"
+    
     def test_unauthorized_access(self, client: TestClient):
         """Test accessing protected endpoint without auth fails."""
         response = client.get("/api/auth/me")
@@ -126,6 +192,23 @@ class TestAPIKeys:
         assert data["api_key_info"]["name"] == "Test API Key"
         assert data["api_key_info"]["scopes"] == ["convert", "library"]
     
+    def test_authenticate_with_api_key(self, client: TestClient, auth_headers: dict, test_user: User, db_session):
+        """Test created API keys resolve to their owner and other keys are rejected."""
+        response = client.post("/api/auth/api-keys",
+            headers=auth_headers,
+            json={"name": "MCP Key"}
+        )
+        key = response.json()["key"]
+        
+        user = get_user_from_api_key(HTTPAuthorizationCredentials(scheme="Bearer", credentials=key), db_session)
+        assert user.id == test_user.id
+        
+        forged = key[:-1] + ("A" if key[-1] != "A" else "B")
+        for bad_key in (forged, "ctxt_short", "not-a-key"):
+            with pytest.raises(HTTPException) as exc_info:
+                get_user_from_api_key(HTTPAuthorizationCredentials(scheme="Bearer", credentials=bad_key), db_session)
+            assert exc_info.value.status_code == 401
+    
     def test_create_api_key_invalid_data(self, client: TestClient, auth_headers: dict):
         """Test creating API key with invalid data fails."""
         response = client.post("/api/auth/api-keys",
@@ -1,9 +1,16 @@
 """Tests for conversion endpoints and functionality."""
 
+import uuid
 import pytest
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, Mock
 from fastapi.testclient import TestClient
-from app.models import User, Conversion
+from app.models import User, Conversion, ContextStack
+from app.services.cache import invalidate_conversion
+from app.services.counter_buffer import counter_buffer
+from app.services.context_stack import ContextStackService
+from app.api.context_stacks import _iter_xml_export
 
 class TestConversionEndpoints:
     """Test conversion API endpoints."""
@@ -31,6 +38,8 @@ class TestConversionEndpoints:
         assert data["title"] == "Test Article"
         assert data["source_url"] == "https://example.com/test"
         assert data["domain"] == "example.com"
+        assert "_rate_limit" not in data
+        assert response.headers["X-RateLimit-Tier"] == "free"
     
     def test_convert_url_without_auth(self, client: TestClient):
         """Test URL conversion without authentication (should work for anonymous users)."""
@@ -51,6 +60,35 @@ class TestConversionEndpoints:
             
             assert response.status_code == 200
     
+    def test_create_conversion_unique_slug(self, client: TestClient):
+        """Test colliding slugs get a suffix instead of failing."""
+        payload = {
+            "title": "A Perfectly Ordinary Article Title",
+            "content": "# Heading\n\nSome **markdown** content here."
+        }
+        first = client.post("/api/conversions", json={**payload, "source_url": "https://example.com/a"})
+        second = client.post("/api/conversions", json={**payload, "source_url": "https://example.com/b"})
+        
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.json()["slug"] == "a-perfectly-ordinary-article-title"
+        assert second.json()["slug"].startswith("a-perfectly-ordinary-article-title-")
+        assert first.json()["word_count"] == 5
+    
+    def test_conversion_page_renders_markdown(self, client: TestClient):
+        """Test conversion pages carry server-rendered, escaped markdown."""
+        response = client.post("/api/conversions", json={
+            "source_url": "https://example.com/rendered",
+            "title": "Rendered Article",
+            "content": "# Heading\n\nSome **markdown** <script>alert(1)</script>"
+        })
+        slug = response.json()["slug"]
+        
+        page = client.get(f"/page/{slug}").text
+        assert "<h1>Heading</h1>" in page
+        assert "<strong>markdown</strong>" in page
+        assert "&lt;script&gt;alert(1)&lt;/script&gt;" in page
+    
     def test_convert_invalid_url(self, client: TestClient, auth_headers: dict):
         """Test conversion with invalid URL."""
         response = client.post("/api/convert",
@@ -95,13 +133,53 @@ class TestConversionLibrary:
     
     def test_list_conversions(self, client: TestClient, auth_headers: dict, sample_conversion: Conversion):
         """Test listing user's conversions."""
-        response = client.get("/api/conversions", headers=auth_headers)
+        response = client.get("/api/conversions?include_total=true", headers=auth_headers)
         
         assert response.status_code == 200
         data = response.json()
         assert data["total"] == 1
         assert len(data["items"]) == 1
         assert data["items"][0]["title"] == sample_conversion.title
+        assert "content" not in data["items"][0]
+        assert data["next_cursor"] is None
+    
+    def test_list_conversions_cursor_pagination(self, client: TestClient, auth_headers: dict, test_user: User, db_session):
+        """Test walking the library with keyset cursors."""
+        base_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for i in range(5):
+            db_session.add(Conversion(
+                id=uuid.uuid4(),
+                slug=f"paged-conversion-{i}",
+                user_id=test_user.id,
+                source_url=f"https://example.com/paged/{i}",
+                title=f"Paged Article {i}",
+                domain="example.com",
+                content="Paged content",
+                created_at=base_time + timedelta(minutes=i)
+            ))
+        db_session.commit()
+        
+        response = client.get("/api/conversions?limit=2", headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        assert [item["slug"] for item in data["items"]] == ["paged-conversion-4", "paged-conversion-3"]
+        assert data["next_cursor"]
+        
+        seen = [item["slug"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        while cursor:
+            data = client.get(f"/api/conversions?limit=2&cursor={cursor}", headers=auth_headers).json()
+            seen.extend(item["slug"] for item in data["items"])
+            cursor = data["next_cursor"]
+        
+        assert seen == [f"paged-conversion-{i}" for i in range(4, -1, -1)]
+    
+    def test_list_conversions_invalid_cursor(self, client: TestClient, auth_headers: dict):
+        """Test malformed cursors are rejected."""
+        response = client.get("/api/conversions?cursor=not-a-cursor", headers=auth_headers)
+        
+        assert response.status_code == 422
     
     def test_get_conversion_by_id(self, client: TestClient, sample_conversion: Conversion):
         """Test getting conversion by ID."""
@@ -112,9 +190,89 @@ class TestConversionLibrary:
         assert data["title"] == sample_conversion.title
         assert data["view_count"] == 1  # Should increment view count
     
+    def test_increment_view_count(self, client: TestClient, sample_conversion: Conversion):
+        """Test view counter is bumped atomically by slug."""
+        url = f"/api/conversions/slug/{sample_conversion.slug}/view"
+        
+        assert client.post(url).json()["view_count"] == 1
+        assert client.post(url).json()["view_count"] == 2
+        
+        response = client.post("/api/conversions/slug/missing-slug/view")
+        assert response.status_code == 404
+    
+    def test_view_count_flush(self, client: TestClient, sample_conversion: Conversion, db_session):
+        """Test buffered views are written to the database in one batch."""
+        for _ in range(3):
+            client.post(f"/api/conversions/slug/{sample_conversion.slug}/view")
+        
+        db_session.refresh(sample_conversion)
+        assert sample_conversion.view_count == 0
+        
+        assert counter_buffer.flush(db_session) == 1
+        db_session.refresh(sample_conversion)
+        assert sample_conversion.view_count == 3
+        assert counter_buffer.pending("view", sample_conversion.slug) == 0
+    
+    def test_use_count_flush(self, sample_context_stack, db_session):
+        """Test buffered context stack uses are flushed by id."""
+        counter_buffer.bump("use", sample_context_stack.id)
+        counter_buffer.bump("use", sample_context_stack.id)
+        
+        assert counter_buffer.flush(db_session) == 1
+        db_session.refresh(sample_context_stack)
+        assert sample_context_stack.use_count == 2
+    
+    def test_get_conversion_by_slug_etag(self, client: TestClient, sample_conversion: Conversion):
+        """Test slug lookups are cached and honour If-None-Match."""
+        url = f"/api/conversions/slug/{sample_conversion.slug}"
+        response = client.get(url)
+        
+        assert response.status_code == 200
+        assert response.json()["title"] == sample_conversion.title
+        etag = response.headers["etag"]
+        
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        
+        response = client.get("/api/conversions/slug/missing-slug")
+        assert response.status_code == 404
+    
+    def test_conversion_page_cached(self, client: TestClient, sample_conversion: Conversion, db_session):
+        """Test rendered pages are cached until the conversion changes."""
+        url = f"/page/{sample_conversion.slug}"
+        response = client.get(url)
+    
+        assert response.status_code == 200
+        assert sample_conversion.title in response.text
+        etag = response.headers["etag"]
+    
+        sample_conversion.title = "Renamed Article"
+        db_session.commit()
+        response = client.get(url)
+        assert response.headers["etag"] == etag
+        assert "Renamed Article" not in response.text
+    
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert counter_buffer.pending("view", sample_conversion.slug) == 3
+    
+        invalidate_conversion(sample_conversion.slug)
+        response = client.get(url)
+        assert "Renamed Article" in response.text
+    
+    def test_conversion_page_markdown_url(self, client: TestClient, sample_conversion: Conversion):
+        """Test markdown lives at its own URL and the page ignores the User-Agent."""
+        response = client.get(f"/page/{sample_conversion.slug}.md")
+        assert response.status_code == 200
+        assert response.text.startswith("---\ntitle: ")
+        
+        response = client.get(f"/page/{sample_conversion.slug}", headers={"User-Agent": "Mozilla/5.0 (compatible; GPTBot/1.1)"})
+        assert response.text.startswith("<!DOCTYPE html>")
+        assert f'href="https://ctxt.help/page/{sample_conversion.slug}.md"' in response.text
+    
     def test_search_conversions(self, client: TestClient, auth_headers: dict, sample_conversion: Conversion):
         """Test searching conversions."""
-        response = client.get("/api/conversions?search=Test", headers=auth_headers)
+        response = client.get("/api/conversions?search=Test&include_total=true", headers=auth_headers)
         
         assert response.status_code == 200
         data = response.json()
@@ -169,7 +327,7 @@ class TestConversionPermissions:
         db_session.commit()
         
         # Test user shouldn't see power user's conversion
-        response = client.get("/api/conversions", headers=auth_headers)
+        response = client.get("/api/conversions?include_total=true", headers=auth_headers)
         
         assert response.status_code == 200
         data = response.json()
@@ -182,7 +340,7 @@ class TestConversionPermissions:
         }).json()
         power_headers = {"Authorization": f"Bearer {power_tokens['access_token']}"}
         
-        response = client.get("/api/conversions", headers=power_headers)
+        response = client.get("/api/conversions?include_total=true", headers=power_headers)
         assert response.status_code == 200
         data = response.json()
         assert data["total"] == 1
@@ -193,4 +351,44 @@ class TestConversionPermissions:
         
         assert response.status_code == 200
         data = response.json()
-        assert data["title"] == sample_conversion.title
\ No newline at end of file
+        assert data["title"] == sample_conversion.title
+
+class TestContextStackXmlExport:
+    """Test XML exports escape block text and tolerate missing fields."""
+    
+    BLOCKS = [
+        {
+            "id": "block-1",
+            "type": "url",
+            "url": "https://example.com/?a=1&b=\"2\"",
+            "title": None,
+            "content": "if a < b && c > d: print(\"<done>\")",
+            "order": 0
+        },
+        {
+            "id": "block-2",
+            "type": "text",
+            "content": None,
+            "order": 1
+        }
+    ]
+    
+    def assert_blocks_round_trip(self, body: str):
+        root = ET.fromstring(body)
+        source = root.find("source_1")
+        assert source.get("title") == "Untitled"
+        assert source.get("url") == self.BLOCKS[0]["url"]
+        assert source.text.strip() == self.BLOCKS[0]["content"]
+        assert root.find("text_2").text.strip() == ""
+    
+    def test_endpoint_export_xml(self):
+        """Test the endpoint's (streamable) XML export is well-formed."""
+        self.assert_blocks_round_trip("".join(_iter_xml_export(self.BLOCKS, None)))
+    
+    def test_service_export_xml(self):
+        """Test the service export escapes the description as well as blocks."""
+        stack = ContextStack(name="Escaping & <friends>", description="Uses \"quotes\" & <tags>")
+        body = ContextStackService()._export_as_xml(stack, self.BLOCKS, None, True)
+        
+        assert ET.fromstring(body).find("description").text == stack.description
+        self.assert_blocks_round_trip(body)
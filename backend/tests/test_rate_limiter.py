@@ -0,0 +1,215 @@
+"""Tests for the conversion rate limiter."""
+
+import math
+import uuid
+import pytest
+import redis
+from datetime import datetime
+from app.core.config import get_daily_reset_at
+from app.models import User, Conversion
+from app.services import rate_limiter as rate_limiter_module
+from app.services.rate_limiter import RateLimiter
+
+FREE_LIMIT = 5
+SECONDS_PER_TOKEN = math.ceil(RateLimiter.WINDOW_SECONDS / FREE_LIMIT)
+
+
+class FakeClock:
+    """Stands in for the time module inside the rate limiter."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeScript:
+    """Python rendition of TOKEN_BUCKET_LUA over the fake client's hashes."""
+
+    def __call__(self, keys, args, client):
+        client.script_calls += 1
+        capacity, rate, now = args
+        bucket = client.hashes.get(keys[0], {})
+        tokens = bucket.get("tokens", capacity)
+        ts = bucket.get("ts", now)
+        tokens = min(capacity, tokens + max(0, now - ts) * rate)
+        allowed = 0
+        if tokens >= 1:
+            tokens -= 1
+            allowed = 1
+        next_token = 0
+        if tokens < capacity:
+            next_token = math.ceil((math.floor(tokens) + 1 - tokens) / rate)
+        client.hashes[keys[0]] = {"tokens": tokens, "ts": now}
+        return [allowed, math.floor(tokens), next_token]
+
+
+class FakeRedis:
+    """Just enough of redis.Redis for RateLimiter."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.script_calls = 0
+
+    def register_script(self, script):
+        return FakeScript()
+
+
+class FailingScript:
+    def __call__(self, keys, args, client):
+        raise redis.ConnectionError("connection refused")
+
+
+class FailingRedis(FakeRedis):
+    def register_script(self, script):
+        return FailingScript()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module, "time", fake)
+    return fake
+
+
+def use_redis(monkeypatch, client):
+    monkeypatch.setattr(rate_limiter_module, "get_redis_client", lambda: client)
+
+
+def add_conversions(db_session, user: User, count: int):
+    for i in range(count):
+        db_session.add(Conversion(
+            id=uuid.uuid4(),
+            slug=f"rate-limit-{i}",
+            user_id=user.id,
+            source_url=f"https://example.com/{i}",
+            content="content"
+        ))
+    db_session.commit()
+
+
+def parse_reset(rate_info: dict) -> datetime:
+    return datetime.fromisoformat(rate_info["reset_time"])
+
+
+class TestRedisTokenBucket:
+    """Rate limiting through the Redis token bucket."""
+
+    def test_bucket_allows_daily_limit_then_denies(self, monkeypatch, clock, db_session, test_user):
+        """The bucket starts full and denies once it is empty."""
+        client = FakeRedis()
+        use_redis(monkeypatch, client)
+        limiter = RateLimiter()
+
+        for used in range(1, FREE_LIMIT + 1):
+            rate_info = limiter.check_rate_limit(db_session, test_user)
+            assert rate_info["allowed"] is True
+            assert rate_info["remaining"] == FREE_LIMIT - used
+            assert rate_info["current_usage"] == used
+            assert rate_info["retry_after"] is None
+
+        rate_info = limiter.check_rate_limit(db_session, test_user)
+        assert rate_info["allowed"] is False
+        assert rate_info["remaining"] == 0
+        assert rate_info["retry_after"] == SECONDS_PER_TOKEN
+
+        headers = RateLimiter.get_rate_limit_headers(rate_info)
+        assert headers["Retry-After"] == str(SECONDS_PER_TOKEN)
+        assert headers["X-RateLimit-Remaining"] == "0"
+
+    def test_reset_time_is_next_token(self, monkeypatch, clock, db_session, test_user):
+        """reset_time reports when the next token arrives, not midnight."""
+        use_redis(monkeypatch, FakeRedis())
+        limiter = RateLimiter()
+
+        before = datetime.utcnow()
+        rate_info = limiter.check_rate_limit(db_session, test_user)
+        after = datetime.utcnow()
+
+        reset = parse_reset(rate_info)
+        assert (reset - before).total_seconds() >= SECONDS_PER_TOKEN
+        assert (reset - after).total_seconds() <= SECONDS_PER_TOKEN
+        assert RateLimiter.get_rate_limit_headers(rate_info)["X-RateLimit-Reset"] == rate_info["reset_time"]
+
+    def test_denied_key_skips_redis_until_refill(self, monkeypatch, clock, db_session, test_user):
+        """Repeat requests inside retry_after are refused without a round-trip."""
+        client = FakeRedis()
+        use_redis(monkeypatch, client)
+        limiter = RateLimiter()
+
+        for _ in range(FREE_LIMIT + 1):
+            limiter.check_rate_limit(db_session, test_user)
+        calls = client.script_calls
+
+        clock.now += SECONDS_PER_TOKEN / 2
+        rate_info = limiter.check_rate_limit(db_session, test_user)
+        assert rate_info["allowed"] is False
+        assert rate_info["retry_after"] == math.ceil(SECONDS_PER_TOKEN / 2)
+        assert client.script_calls == calls
+
+        clock.now += SECONDS_PER_TOKEN / 2
+        rate_info = limiter.check_rate_limit(db_session, test_user)
+        assert rate_info["allowed"] is True
+        assert client.script_calls == calls + 1
+
+    def test_anonymous_callers_are_bucketed_by_ip(self, monkeypatch, clock, db_session):
+        """Anonymous requests share a bucket per client IP."""
+        client = FakeRedis()
+        use_redis(monkeypatch, client)
+        limiter = RateLimiter()
+
+        for _ in range(FREE_LIMIT):
+            assert limiter.check_rate_limit(db_session, client_ip="203.0.113.7")["allowed"] is True
+        assert limiter.check_rate_limit(db_session, client_ip="203.0.113.7")["allowed"] is False
+        assert limiter.check_rate_limit(db_session, client_ip="203.0.113.8")["allowed"] is True
+        assert set(client.hashes) == {"rl:203.0.113.7", "rl:203.0.113.8"}
+
+    def test_unlimited_tier_never_touches_redis(self, monkeypatch, clock, db_session, power_user):
+        """Tiers without a daily limit are always allowed."""
+        client = FakeRedis()
+        use_redis(monkeypatch, client)
+
+        rate_info = RateLimiter().check_rate_limit(db_session, power_user)
+        assert rate_info["allowed"] is True
+        assert rate_info["daily_limit"] is None
+        assert client.script_calls == 0
+
+
+class TestDatabaseFallback:
+    """Rate limiting from the conversion count when Redis is unavailable."""
+
+    def test_counts_recent_conversions_without_redis(self, monkeypatch, db_session, test_user):
+        """Without Redis, usage is the user's conversions from the last day."""
+        use_redis(monkeypatch, None)
+        add_conversions(db_session, test_user, 2)
+
+        rate_info = RateLimiter().check_rate_limit(db_session, test_user)
+        assert rate_info["allowed"] is True
+        assert rate_info["current_usage"] == 2
+        assert rate_info["remaining"] == FREE_LIMIT - 2
+        assert rate_info["reset_time"] == get_daily_reset_at().isoformat()
+        assert rate_info["retry_after"] is None
+
+    def test_denies_at_limit_without_redis(self, monkeypatch, db_session, test_user):
+        """The fallback denies once the daily limit is used up."""
+        use_redis(monkeypatch, None)
+        add_conversions(db_session, test_user, FREE_LIMIT)
+
+        rate_info = RateLimiter().check_rate_limit(db_session, test_user)
+        assert rate_info["allowed"] is False
+        assert rate_info["remaining"] == 0
+        assert "Retry-After" not in RateLimiter.get_rate_limit_headers(rate_info)
+
+    def test_redis_error_falls_back_to_count(self, monkeypatch, clock, db_session, test_user):
+        """A Redis failure mid-check falls back to the conversion count."""
+        use_redis(monkeypatch, FailingRedis())
+        add_conversions(db_session, test_user, 1)
+
+        rate_info = RateLimiter().check_rate_limit(db_session, test_user)
+        assert rate_info["allowed"] is True
+        assert rate_info["current_usage"] == 1
+        assert rate_info["reset_time"] == get_daily_reset_at().isoformat()
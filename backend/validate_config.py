@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Validate the committed environment configs (config/*.json) for ctxt.help
+
+Each file is merged on its own over the base configuration built from the
+current environment variables, as ConfigurationManager does at startup for that
+environment, and checked with ConfigurationManager.validate_config. Run it in
+CI whenever config/ changes.
+"""
+
+import json
+import sys
+import os
+from pathlib import Path
+
+# Add the app directory to Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.config_manager import ConfigurationManager
+
+CONFIG_DIR = Path(__file__).parent / "config"
+
+
+def validate_file(path: Path) -> bool:
+    """Validate one environment config file; returns True when it passes"""
+    environment = path.stem
+    try:
+        overrides = json.loads(path.read_text())
+    except ValueError as e:
+        print(f"❌ {path.name}: invalid JSON: {e}")
+        return False
+    if not isinstance(overrides, dict):
+        print(f"❌ {path.name}: top level must be an object")
+        return False
+
+    config = ConfigurationManager.build_base_config()
+    ConfigurationManager.merge_config(config, overrides)
+
+    errors, warnings = ConfigurationManager.validate_config(config, environment)
+    for warning in warnings:
+        print(f"⚠️  {path.name}: {warning}")
+    for error in errors:
+        print(f"❌ {path.name}: {error}")
+    if not errors:
+        print(f"✅ {path.name}")
+    return not errors
+
+
+def main(paths) -> int:
+    results = [validate_file(Path(p)) for p in paths or sorted(CONFIG_DIR.glob("*.json"))]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -49,11 +49,17 @@ export interface ConversionCreateRequest {
   options?: ConversionOptions;
 }
 
+// Library listings omit the markdown content; fetch the conversion for it
+export type ConversionListItem = Omit<Conversion, 'content' | 'updated_at'> & {
+  topics?: string[] | null;
+};
+
 export interface ConversionList {
-  items: Conversion[];
-  total: number;
+  items: ConversionListItem[];
+  total?: number | null;
   limit: number;
   offset: number;
+  next_cursor?: string | null;
 }
 
 export interface ContextBlock {
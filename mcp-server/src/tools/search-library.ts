@@ -20,7 +20,7 @@ export const searchLibraryTool = {
         params: {
           search: input.query,
           limit: input.limit || 10,
-          offset: 0
+          include_total: true
         },
         headers: {
           'Authorization': `Bearer ${input.api_key}`,
@@ -65,7 +65,7 @@ export const searchLibraryTool = {
           `**Permanent Link:** ${readUrl}`,
           '',
           `**Preview:**`,
-          item.meta_description || item.content.slice(0, 200) + '...',
+          item.meta_description || '(no description)',
           '',
           '---',
           ''
@@ -91,7 +91,7 @@ export const searchLibraryTool = {
           query: input.query,
           results_shown: searchResults.items.length,
           total_results: searchResults.total,
-          has_more: searchResults.total > searchResults.items.length
+          has_more: Boolean(searchResults.next_cursor)
         }
       };
       